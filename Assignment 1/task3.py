@@ -1,8 +1,100 @@
+import argparse
+import os
+from typing import BinaryIO, Iterator
+
+# Bytes read per step when reversing files
+BLOCK_SIZE = 1 << 20
+
+
 def reverse_string(input_string):
     # Using string slicing with step -1 to reverse the string
     return input_string[::-1]
 
+
+def _backward_blocks(f: BinaryIO, block_size: int) -> Iterator[bytes]:
+    """Yield the blocks of a binary file from the last one to the first."""
+    pos = f.seek(0, os.SEEK_END)
+    while pos > 0:
+        start = max(0, pos - block_size)
+        f.seek(start)
+        block = f.read(pos - start)
+        pos = start
+        yield block
+
+
+def reverse_file(src, dst, block_size=BLOCK_SIZE, lines=False):
+    """Write the characters of UTF-8 file src to dst in reverse order.
+
+    The source is read backwards block by block and each reversed block is
+    written out at once, so memory is bounded by block_size however large
+    the file is. Continuation bytes at the start of a block belong to a
+    character that begins in the previous block; they are carried over so
+    multibyte characters are never split. Bytes that are not valid UTF-8
+    are passed through unchanged (as single units).
+
+    With lines=True the order of the lines is reversed instead (see reverse_lines).
+    """
+    if lines:
+        reverse_lines(src, dst, block_size)
+        return
+    with open(src, 'rb') as fin, open(dst, 'wb') as fout:
+        carry = b''
+        for block in _backward_blocks(fin, block_size):
+            data = block + carry
+            # At most 3 continuation bytes can follow a lead byte
+            i = 0
+            while i < len(data) and i < 3 and data[i] & 0xC0 == 0x80:
+                i += 1
+            carry = data[:i]
+            text = data[i:].decode('utf-8', 'surrogateescape')
+            fout.write(text[::-1].encode('utf-8', 'surrogateescape'))
+        if carry:
+            # Continuation bytes at the very start of the file have no lead byte
+            fout.write(carry.decode('utf-8', 'surrogateescape')[::-1].encode('utf-8', 'surrogateescape'))
+
+
+def reverse_lines(src, dst, block_size=BLOCK_SIZE):
+    """Write the lines of src to dst in reverse order, like tac.
+
+    Uses the same backward block reader as reverse_file. Every output line
+    ends with a newline, including the last line of src if it had none;
+    line contents (and any '\\r') are kept byte for byte. Memory is bounded
+    by block_size plus the longest line.
+    """
+    with open(src, 'rb') as fin, open(dst, 'wb') as fout:
+        tail = None  # start of the line that continues into earlier blocks
+        for block in _backward_blocks(fin, block_size):
+            if tail is None:
+                # Last block of the file: its final newline ends the last line
+                data = block[:-1] if block.endswith(b'\n') else block
+            else:
+                data = block + tail
+            parts = data.split(b'\n')
+            tail = parts[0]
+            if len(parts) > 1:
+                parts.reverse()
+                parts.pop()
+                fout.write(b'\n'.join(parts) + b'\n')
+        if tail is not None:
+            fout.write(tail + b'\n')
+
+
 def main():
+    parser = argparse.ArgumentParser(description='Reverse a string, or a file of any size')
+    parser.add_argument('src', nargs='?', help='File to reverse (default: prompt for a string)')
+    parser.add_argument('dst', nargs='?', help='Where to write the reversed file')
+    parser.add_argument('-l', '--lines', action='store_true', help='Reverse the order of lines (like tac)')
+    parser.add_argument('--block-size', type=int, default=BLOCK_SIZE,
+                        help=f'Bytes read per step (default: {BLOCK_SIZE})')
+    args = parser.parse_args()
+
+    if args.src:
+        if not args.dst:
+            parser.error('dst is required when src is given')
+        reverse_file(args.src, args.dst, args.block_size, lines=args.lines)
+        print(f"Wrote reversed {'lines' if args.lines else 'text'} of {args.src} to {args.dst}")
+        return
+
     # Get input string from user
     user_string = input("Enter a string to reverse: ")
     
@@ -1,3 +1,12 @@
+import sys
+import time
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is only needed for FactorialTable.comb_many
+    np = None
+
 # Recursive version of factorial
 def factorial_recursive(n):
     """
@@ -33,6 +42,161 @@ def factorial_iterative(n):
     
     return result
 
+def _odd_product(lo, hi):
+    """
+    Multiply the odd numbers in [lo, hi), where lo is odd.
+    Splits the range in half so the big multiplications happen between
+    operands of similar size. Recursion depth is only log2 of the count.
+    """
+    count = (hi - lo + 1) // 2
+    if count < 16:
+        result = 1
+        for i in range(lo, hi, 2):
+            result *= i
+        return result
+    mid = lo + 2 * (count // 2)
+    return _odd_product(lo, mid) * _odd_product(mid, hi)
+
+# Binary-splitting version of factorial
+def factorial_fast(n):
+    """
+    Calculate factorial by binary splitting
+    n! = (odd part of n!) * 2**(n - popcount(n))
+    The odd part is the product over levels i of (odd numbers in
+    (n >> (i+1), n >> i]) raised to the power i+1, accumulated from the top
+    level down, with each range multiplied as a balanced product tree.
+    """
+    if n < 0:
+        raise ValueError("Factorial is not defined for negative numbers")
+
+    inner = outer = 1
+    for i in range(n.bit_length() - 1, -1, -1):
+        lo = ((n >> (i + 1)) + 1) | 1
+        hi = (n >> i) + 1
+        if lo < hi:
+            inner *= _odd_product(lo, hi)
+        outer *= inner
+
+    # Put back the factors of two
+    return outer << (n - bin(n).count("1"))
+
+# Precomputed factorial tables for modular nCr / nPr queries
+class FactorialTable:
+    """
+    Factorials and inverse factorials modulo a prime `mod`, precomputed up to
+    max_n in O(max_n) and stored in compact array('q') buffers.
+    comb(n, k) and perm(n, k) are then O(1); the tables grow on demand.
+    Every n queried must be smaller than mod, else ValueError is raised:
+    n! is 0 mod p from n = p on, so the tables cannot give C(n, k) mod p
+    there (it is not 0 in general; Lucas' theorem computes it).
+    """
+
+    def __init__(self, mod, max_n=0):
+        if mod < 2 or mod >= 1 << 63:
+            raise ValueError("Modulus must be a prime in [2, 2**63)")
+        self.mod = mod
+        self.fact = array('q', [1])
+        self.inv_fact = array('q', [1])
+        self._grow(max_n)
+
+    @property
+    def max_n(self):
+        """Largest n the tables currently cover"""
+        return len(self.fact) - 1
+
+    def _grow(self, n):
+        """Extend both tables so they cover 0..n"""
+        old = self.max_n
+        if n <= old:
+            return
+        if n >= self.mod:
+            raise ValueError("n must be smaller than the modulus")
+
+        mod = self.mod
+        f = self.fact[old]
+        new_fact = [0] * (n - old)
+        for i in range(old + 1, n + 1):
+            f = f * i % mod
+            new_fact[i - old - 1] = f
+
+        # One modular inverse at the top, then walk down: 1/(i-1)! = i / i!
+        inv = pow(f, mod - 2, mod)
+        new_inv = [0] * (n - old)
+        for i in range(n, old, -1):
+            new_inv[i - old - 1] = inv
+            inv = inv * i % mod
+
+        self.fact.extend(new_fact)
+        self.inv_fact.extend(new_inv)
+
+    def _ensure(self, n):
+        """Grow the tables to cover n, at least doubling them to amortize growth"""
+        if n >= self.mod:
+            raise ValueError("n must be smaller than the modulus")
+        if n > self.max_n:
+            self._grow(min(max(n, 2 * self.max_n), self.mod - 1))
+
+    def comb(self, n, k):
+        """Return C(n, k) mod p (0 when k < 0 or k > n)"""
+        if k < 0 or n < 0 or k > n:
+            return 0
+        self._ensure(n)
+        return self.fact[n] * self.inv_fact[k] % self.mod * self.inv_fact[n - k] % self.mod
+
+    def perm(self, n, k):
+        """Return P(n, k) = n! / (n-k)! mod p (0 when k < 0 or k > n)"""
+        if k < 0 or n < 0 or k > n:
+            return 0
+        self._ensure(n)
+        return self.fact[n] * self.inv_fact[n - k] % self.mod
+
+    def comb_many(self, ns, ks):
+        """
+        Vectorized comb over NumPy arrays (or array-likes) of n and k values.
+        Returns an int64 array of C(n, k) mod p, 0 where k < 0 or k > n.
+        """
+        if np is None:
+            raise ImportError("comb_many requires NumPy")
+
+        ns, ks = np.broadcast_arrays(np.asarray(ns, dtype=np.int64), np.asarray(ks, dtype=np.int64))
+        valid = (ks >= 0) & (ks <= ns)
+        if valid.any():
+            self._ensure(int(ns[valid].max()))
+
+        # Zero-copy views of the tables; they must not outlive this call,
+        # since an exported buffer stops the arrays from growing
+        fact = np.frombuffer(self.fact, dtype=np.int64)
+        inv_fact = np.frombuffer(self.inv_fact, dtype=np.int64)
+
+        n = np.where(valid, ns, 0)
+        k = np.where(valid, ks, 0)
+        if self.mod < 1 << 31:
+            # Products of two residues fit in int64
+            result = fact[n] * inv_fact[k] % self.mod * inv_fact[n - k] % self.mod
+        else:
+            # Fall back to Python integers to avoid int64 overflow
+            result = (fact[n].astype(object) * inv_fact[k] % self.mod * inv_fact[n - k] % self.mod).astype(np.int64)
+        del fact, inv_fact
+
+        return np.where(valid, result, 0)
+
+def benchmark():
+    """
+    Compare factorial_fast with the recursive and iterative versions.
+    The recursive version is only timed while it stays under the recursion limit.
+    """
+    print(f"{'n':>8} {'recursive':>12} {'iterative':>12} {'fast':>12}")
+    for n in (500, 5000, 50000, 100000):
+        timings = []
+        for func in (factorial_recursive, factorial_iterative, factorial_fast):
+            if func is factorial_recursive and n >= sys.getrecursionlimit() - 50:
+                timings.append(f"{'-':>12}")
+                continue
+            start = time.perf_counter()
+            func(n)
+            timings.append(f"{time.perf_counter() - start:11.4f}s")
+        print(f"{n:>8} " + " ".join(timings))
+
 def main():
     try:
         # Get input from user
@@ -42,6 +206,7 @@ def main():
         print(f"\nCalculating factorial of {num}:")
         print(f"Using recursive method: {factorial_recursive(num)}")
         print(f"Using iterative method: {factorial_iterative(num)}")
+        print(f"Using fast method: {factorial_fast(num)}")
         
     except ValueError as e:
         # Handle both invalid input and negative numbers
@@ -51,4 +216,7 @@ def main():
             print("Please enter a valid integer number")
 
 if __name__ == "__main__":
-    main()
+    if "--benchmark" in sys.argv[1:]:
+        benchmark()
+    else:
+        main()
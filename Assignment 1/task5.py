@@ -7,11 +7,31 @@ This file provides two implementations:
 
 Both functions raise a ValueError for an empty list and TypeError for non-numeric
 elements. Example usage is included in the `main()` function.
+
+For large inputs there is also a streaming API that never builds a list:
+ - iter_max(source): largest value of any iterable, generator or numeric file
+ - top_k(source, k): the k largest values, kept in a bounded heap of size k
 """
 
-from typing import List, Union
+import heapq
+import os
+from array import array
+from itertools import islice
+from typing import IO, Iterable, Iterator, List, Union
+
+try:
+	import numpy as np
+except ImportError:  # NumPy arrays are only special-cased when it is installed
+	np = None
 
 Number = Union[int, float]
+Source = Union[Iterable[Number], IO[str], str, os.PathLike]
+
+# array typecodes that hold numbers (everything except 'u' / 'w' characters)
+_NUMERIC_TYPECODES = frozenset("bBhHiIlLqQfd")
+
+# Elements of a NumPy array that top_k partitions at a time
+_TOP_K_CHUNK = 1 << 20
 
 
 def manual_max(lst: List[Number]) -> Number:
@@ -37,7 +57,7 @@ def manual_max(lst: List[Number]) -> Number:
 	current_max = first
 
 	# Iterate through remaining elements and update current_max
-	for x in lst[1:]:
+	for x in islice(lst, 1, None):
 		if not isinstance(x, (int, float)):
 			raise TypeError("List must contain only numeric values (int or float)")
 		if x > current_max:
@@ -75,6 +95,143 @@ def builtin_max(lst: List[Number]) -> Number:
 	return result
 
 
+def _parse_number(token: str) -> Number:
+	"""Parse one token from a numeric file as an int, or a float if it is not one."""
+	try:
+		return int(token)
+	except ValueError:
+		pass
+	try:
+		return float(token)
+	except ValueError:
+		raise TypeError(f"File must contain only numeric values, got {token!r}") from None
+
+
+def _read_numbers(f: IO[str]) -> Iterator[Number]:
+	"""Yield the numbers of a text file line by line (whitespace or comma separated)."""
+	for line in f:
+		for token in line.replace(",", " ").split():
+			yield _parse_number(token)
+
+
+def _iter_numbers(source: Source) -> Iterator[Number]:
+	"""Yield validated numbers from an iterable, an open text file or a file path."""
+	if isinstance(source, (str, os.PathLike)):
+		with open(source, "r", encoding="utf-8") as f:
+			yield from _read_numbers(f)
+		return
+	if hasattr(source, "read"):
+		yield from _read_numbers(source)
+		return
+	for x in source:
+		if not isinstance(x, (int, float)):
+			raise TypeError("Input must contain only numeric values (int or float)")
+		yield x
+
+
+def _numeric_buffer(source):
+	"""
+	Return source if it is an array.array or NumPy array of numbers, else None.
+	The element type is checked once for the whole buffer.
+	"""
+	if isinstance(source, array):
+		if source.typecode not in _NUMERIC_TYPECODES:
+			raise TypeError("array must hold numeric values")
+		return source
+	if np is not None and isinstance(source, np.ndarray):
+		if source.dtype.kind not in "biuf":
+			raise TypeError("NumPy array must have a numeric dtype")
+		return source
+	return None
+
+
+def _max_ignoring_nan(values: Iterable[Number]) -> Number:
+	"""Largest of a non-empty iterable of numbers, skipping NaN (NaN if all are)."""
+	values = iter(values)
+	current_max = next(values)
+	for x in values:
+		# current_max != current_max: still NaN, take whatever comes next
+		if x > current_max or current_max != current_max:
+			current_max = x
+	return current_max
+
+
+def iter_max(source: Source) -> Number:
+	"""Return the largest number from any iterable, generator or numeric file.
+
+	source may be an iterable of numbers, an open text file or a path to one
+	(numbers separated by whitespace or commas). Values are consumed one at a
+	time, so no list is built. array.array and NumPy arrays take a fast path
+	with a single dtype check instead of per-element checks. NaN values are
+	ignored on every path; the result is NaN only if every value is NaN.
+
+	Raises:
+		ValueError: if source is empty
+		TypeError: if source contains a non-numeric value
+
+	Time complexity: O(n)
+	Space complexity: O(1) additional space
+	"""
+	buffer = _numeric_buffer(source)
+	if buffer is not None:
+		if isinstance(buffer, array):
+			if len(buffer) == 0:
+				raise ValueError("Cannot determine max of an empty input")
+			# max() already skips NaN, unless the first value is NaN
+			result = max(buffer)
+			return result if result == result else _max_ignoring_nan(buffer)
+		if buffer.size == 0:
+			raise ValueError("Cannot determine max of an empty input")
+		return np.fmax.reduce(buffer, axis=None).item()
+
+	try:
+		return _max_ignoring_nan(_iter_numbers(source))
+	except StopIteration:
+		raise ValueError("Cannot determine max of an empty input") from None
+
+
+def top_k(source: Source, k: int) -> List[Number]:
+	"""Return the k largest numbers from source, largest first.
+
+	Accepts the same sources as iter_max. Values stream through a bounded heap
+	of size k, so memory stays O(k) however large the input is; a NumPy array
+	(e.g. a memory map) is partitioned a chunk at a time, keeping only the k
+	best values between chunks. NaN values are ignored. Returns fewer than k
+	values if the input is shorter.
+
+	Raises:
+		ValueError: if k is negative
+		TypeError: if source contains a non-numeric value
+
+	Time complexity: O(n log k)
+	Space complexity: O(k) additional space
+	"""
+	if k < 0:
+		raise ValueError("k must be non-negative")
+	if k == 0:
+		return []
+
+	buffer = _numeric_buffer(source)
+	if buffer is not None and not isinstance(buffer, array):
+		best = np.empty(0, dtype=buffer.dtype)
+		step = max(_TOP_K_CHUNK, k)
+		for start in range(0, buffer.size, step):
+			# .flat slices copy just this chunk, whatever the array's layout
+			chunk = buffer.flat[start:start + step]
+			if buffer.dtype.kind == "f":
+				chunk = chunk[~np.isnan(chunk)]
+			best = np.concatenate((best, chunk))
+			if best.size > k:
+				best = np.partition(best, best.size - k)[best.size - k:]
+		return np.sort(best)[::-1].tolist()
+	if buffer is not None:
+		if buffer.typecode in "fd":
+			return heapq.nlargest(k, (x for x in buffer if x == x))
+		return heapq.nlargest(k, buffer)
+
+	return heapq.nlargest(k, (x for x in _iter_numbers(source) if x == x))
+
+
 def main():
 	examples = [
 		[3, 1, 7, 4],
@@ -97,6 +254,11 @@ def main():
 		except Exception as e:
 			print("  builtin_max raised:", type(e).__name__, "-", e)
 
+	# Streaming versions work on generators without building a list
+	squares = (x * x % 1000 for x in range(100000))
+	print("iter_max(generator) ->", iter_max(squares))
+	print("top_k(generator, 3) ->", top_k((x * x % 1000 for x in range(100000)), 3))
+
 
 if __name__ == "__main__":
 	main()
@@ -1,16 +1,23 @@
 import math
 
+def _rectangle_area(x, y):
+    if y is None:
+        raise ValueError("Rectangle requires both length and width.")
+    return x * y
+
+# Dispatch table: one dict lookup instead of a chain of string comparisons
+AREA_FUNCTIONS = {
+    "rectangle": _rectangle_area,
+    "square": lambda x, y=None: x * x,
+    "circle": lambda x, y=None: math.pi * x * x,
+}
+
 def calculate_area(shape, x, y=None):
     shape = shape.lower()
-    if shape == "rectangle":
-        if y is None:
-            raise ValueError("Rectangle requires both length and width.")
-        return x * y
-    if shape == "square":
-        return x * x
-    if shape == "circle":
-        return math.pi * x * x
-    raise ValueError(f"Unsupported shape: {shape}")
+    func = AREA_FUNCTIONS.get(shape)
+    if func is None:
+        raise ValueError(f"Unsupported shape: {shape}")
+    return func(x, y)
 # Example usage:
 print(calculate_area("rectangle", 5, 10))  # Output: 50
 print(calculate_area("square", 4))          # Output: 16
\ No newline at end of file
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""Persistent on-disk cache of parsed numeric CSV columns.
+
+Parsing a large CSV is far slower than reading raw doubles, so the first
+run stores each numeric column as a raw float64 file in a cache directory,
+next to a manifest.json that records the source path, size, mtime and a
+hash of the header line. Later runs memory-map the column files instead
+of parsing. An entry is invalidated automatically when any of those keys
+change, and the total cache size is capped by evicting the least recently
+used source files first.
+
+Used by task 2.1.py and task 2.4.py through their --cache option.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import tempfile
+import time
+from array import array
+from typing import Dict, Iterable, List
+
+from csv_scan import iter_numeric_blocks, read_header
+
+# Default cache location and size cap
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'csv_columns')
+DEFAULT_MAX_BYTES = 4 * 1024 ** 3
+
+MANIFEST = 'manifest.json'
+
+
+def _header_hash(path: str) -> str:
+    """Return a SHA-256 of the raw header line of the CSV."""
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.readline()).hexdigest()
+
+
+def _map_column(path: str) -> memoryview:
+    """Memory-map a raw float64 column file as a read-only memoryview of doubles."""
+    if os.path.getsize(path) == 0:
+        return memoryview(array('d'))
+    with open(path, 'rb') as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return memoryview(mm).cast('d')
+
+
+class ColumnCache:
+    """Cache of parsed numeric CSV columns stored as raw float64 files.
+
+    Columns are returned as memoryviews of doubles backed by a memory map,
+    so nothing is copied; wrap one in numpy.frombuffer for a NumPy array.
+    Entries are keyed by the absolute path of the CSV and checked against
+    its size, mtime and header hash on every lookup.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR,
+                 max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+        self.manifest_path = os.path.join(cache_dir, MANIFEST)
+        self.entries: Dict[str, Dict] = self._load_manifest()
+
+    def _load_manifest(self) -> Dict[str, Dict]:
+        """Load the manifest, starting empty if it is missing or unreadable."""
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _save_manifest(self) -> None:
+        """Write the manifest atomically (temp file + rename)."""
+        tmp = self.manifest_path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f)
+        os.replace(tmp, self.manifest_path)
+
+    def _column_file(self, key: str, index: int) -> str:
+        """Path of the raw float64 file holding one cached column."""
+        return os.path.join(self.cache_dir, f'{key}_{index}.f64')
+
+    def _drop(self, key: str) -> None:
+        """Remove an entry and its column files."""
+        entry = self.entries.pop(key, None)
+        if entry is None:
+            return
+        for index in entry['columns']:
+            try:
+                os.remove(self._column_file(key, int(index)))
+            except FileNotFoundError:
+                pass
+
+    def _store_columns(self, key: str, source: str, indices: List[int]) -> Dict[int, int]:
+        """Parse the given columns of source straight into their column files.
+
+        Values are streamed block by block into temp files, so memory stays
+        bounded by the scanner's block size; each file is then moved into
+        place with os.replace, never truncating a file another process may
+        have memory-mapped. Returns {column index: number of values}.
+        """
+        counts = dict.fromkeys(indices, 0)
+        temps = {}
+        try:
+            for index in indices:
+                fd, temps[index] = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+                os.close(fd)
+            files = [open(temps[index], 'wb') for index in indices]
+            try:
+                for block in iter_numeric_blocks(source, indices):
+                    for index, f, values in zip(indices, files, block):
+                        values.tofile(f)
+                        counts[index] += len(values)
+            finally:
+                for f in files:
+                    f.close()
+            for index in indices:
+                os.replace(temps.pop(index), self._column_file(key, index))
+        finally:
+            for tmp in temps.values():
+                os.remove(tmp)
+        return counts
+
+    def _entry_bytes(self, entry: Dict) -> int:
+        return sum(count * 8 for count in entry['columns'].values())
+
+    def _evict(self, keep: str) -> None:
+        """Evict least recently used entries until the cache fits max_bytes."""
+        total = sum(self._entry_bytes(e) for e in self.entries.values())
+        for key in sorted(self.entries, key=lambda k: self.entries[k]['last_used']):
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            total -= self._entry_bytes(self.entries[key])
+            self._drop(key)
+
+    def get_columns(self, path: str, columns: Iterable[int]) -> Dict[int, memoryview]:
+        """Return {column index: values} for the CSV at path, parsing only on a miss.
+
+        Blank and non-numeric cells are skipped, as in csv_scan. Columns not
+        cached yet are parsed in one scan and stored; if the source changed
+        since it was cached (size, mtime or header), the entry is rebuilt.
+        """
+        columns = list(columns)
+        source = os.path.abspath(path)
+        key = hashlib.sha1(source.encode('utf-8')).hexdigest()
+        st = os.stat(source)
+        header_hash = _header_hash(source)
+
+        entry = self.entries.get(key)
+        if entry is not None and (entry['size'] != st.st_size or entry['mtime_ns'] != st.st_mtime_ns
+                                  or entry['header_hash'] != header_hash):
+            self._drop(key)
+            entry = None
+        if entry is None:
+            entry = {'path': source, 'size': st.st_size, 'mtime_ns': st.st_mtime_ns,
+                     'header_hash': header_hash, 'columns': {}, 'last_used': 0.0}
+            self.entries[key] = entry
+
+        missing = [i for i in columns if str(i) not in entry['columns']]
+        if missing:
+            for index, count in self._store_columns(key, source, missing).items():
+                entry['columns'][str(index)] = count
+
+        entry['last_used'] = time.time()
+        if self._entry_bytes(entry) > self.max_bytes:
+            # Larger than the whole cache: serve it once without keeping it
+            result = {}
+            for i in columns:
+                values = array('d')
+                with open(self._column_file(key, i), 'rb') as f:
+                    values.frombytes(f.read())
+                result[i] = memoryview(values)
+            self._drop(key)
+            self._save_manifest()
+            return result
+
+        self._evict(keep=key)
+        self._save_manifest()
+        return {i: _map_column(self._column_file(key, i)) for i in columns}
+
+    def get_named_columns(self, path: str, names: List[str]) -> Dict[str, memoryview]:
+        """Like get_columns, but addressed by header names."""
+        header, _ = read_header(path)
+        for name in names:
+            if name not in header:
+                raise KeyError(f"Column '{name}' not found in CSV")
+        by_index = self.get_columns(path, [header.index(name) for name in names])
+        return {name: by_index[header.index(name)] for name in names}
+
+    def clear(self) -> None:
+        """Remove every cached entry."""
+        for key in list(self.entries):
+            self._drop(key)
+        self._save_manifest()
+
@@ -0,0 +1,423 @@
+#!/usr/bin/env python3
+"""Fast extraction of numeric CSV columns via a memory-mapped byte scan.
+
+csv.DictReader builds a dict and a str for every cell. This module instead
+memory-maps the file, splits blocks of raw bytes on newlines and commas,
+and decodes only the requested columns straight into array('d') buffers
+(wrap them with numpy.frombuffer for zero-copy NumPy arrays). Records that
+contain a double quote fall back to the csv module, so quoted fields are
+still parsed correctly, including quoted commas and newlines.
+
+iter_stream_blocks does the same for a binary stream such as stdin, where
+the file cannot be mapped.
+
+Used by task 2.1.py and task 2.4.py. Run with --benchmark to compare
+against csv.DictReader.
+"""
+
+import argparse
+import csv
+import mmap
+import os
+import random
+import tempfile
+import time
+from array import array
+from typing import BinaryIO, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+# Bytes of the file handled per block; blocks always end on a line boundary
+BLOCK_SIZE = 4 * 1024 * 1024
+
+Column = Union[str, int]
+
+
+def _parse_header(line: bytes) -> List[str]:
+    return next(csv.reader([line.decode('utf-8-sig')]), [])
+
+
+def read_header(path: str) -> Tuple[List[str], int]:
+    """Return the parsed header row and the byte offset where data rows start."""
+    with open(path, 'rb') as f:
+        line = f.readline()
+        data_start = f.tell()
+    return _parse_header(line), data_start
+
+
+def _resolve_columns(header: Sequence[str], columns: Sequence[Column]) -> List[int]:
+    """Map column names (or indices) to header indices."""
+    indices = []
+    for col in columns:
+        if isinstance(col, int):
+            if not 0 <= col < len(header):
+                raise KeyError(f'Column index {col} out of range')
+            indices.append(col)
+        elif col in header:
+            indices.append(header.index(col))
+        else:
+            raise KeyError(f"Column '{col}' not found in CSV")
+    return indices
+
+
+# First bytes a float() literal can start with (digits, sign, dot, inf, nan)
+_NUMBER_START = frozenset(bytes([b]) for b in b'0123456789+-.iInN')
+
+
+def cells_to_array(cells: List[bytes]) -> array:
+    """Convert one column's cells to array('d'), skipping blanks and non-numeric values."""
+    values = array('d')
+    try:
+        # Fast path: the whole column converts in one C-level pass
+        values.extend(map(float, cells))
+        return values
+    except ValueError:
+        pass
+
+    # Drop blanks and cells that cannot start a number, then retry in one pass
+    cells = [cell for cell in cells if cell.lstrip()[:1] in _NUMBER_START]
+    values = array('d')
+    try:
+        values.extend(map(float, cells))
+        return values
+    except ValueError:
+        pass
+
+    values = array('d')
+    for cell in cells:
+        try:
+            values.append(float(cell))
+        except ValueError:
+            continue
+    return values
+
+
+def _open_quote(data: bytes, quoted: bool = False) -> int:
+    """Return where the quoted field still open at the end of data starts, or -1.
+
+    data must start at a record start, or inside a quoted field when
+    `quoted` is True (then 0 is returned if that field never closes).
+    Follows the csv module: only a quote at the start of a field opens a
+    quoted field, "" inside one is an escaped quote, and any other quote
+    is a literal character.
+    """
+    opened = 0 if quoted else -1
+    pos = 0
+    while True:
+        if opened >= 0:
+            close = data.find(b'"', pos)
+            if close == -1:
+                return opened
+            if data[close + 1:close + 2] == b'"':
+                pos = close + 2
+                continue
+            opened = -1
+            pos = close + 1
+        else:
+            quote = data.find(b'"', pos)
+            if quote == -1:
+                return -1
+            if quote == 0 or data[quote - 1] in b',\n':
+                opened = quote
+            pos = quote + 1
+
+
+def _split_rows(chunk: bytes) -> List[List[bytes]]:
+    """Split a chunk of lines into rows of cells.
+
+    Lines without quotes are split on commas directly. A line with quotes,
+    joined with the following lines while a quoted field is still open,
+    goes through the csv module, so quoted commas and newlines are kept.
+    """
+    rows = []
+    lines = iter(chunk.split(b'\n'))
+    for line in lines:
+        if b'"' not in line:
+            if line.strip():
+                rows.append(line.split(b','))
+            continue
+        record = [line]
+        open_field = _open_quote(line) >= 0
+        while open_field:
+            line = next(lines, None)
+            if line is None:
+                break
+            record.append(line)
+            open_field = _open_quote(line, True) >= 0
+        row = next(csv.reader([line.decode('utf-8') + '\n' for line in record]), [])
+        rows.append([cell.encode('utf-8') for cell in row])
+    return rows
+
+
+def _record_end(buf, stop: int, end: int) -> int:
+    """Move `stop` past further lines of buf[:end] while a quoted field is open.
+
+    `stop` must be inside a quoted field (see _open_quote). Returns the
+    new stop, or end if the field never closes.
+    """
+    open_field = True
+    while open_field and stop < end:
+        nl = buf.find(b'\n', stop, end)
+        nxt = end if nl == -1 else nl + 1
+        open_field = _open_quote(buf[stop:nxt], True) >= 0
+        stop = nxt
+    return stop
+
+
+def _iter_chunks(path: str, start: Optional[int], end: Optional[int],
+                 block_size: int) -> Iterator[bytes]:
+    """Yield record-aligned chunks of raw bytes from the data rows of the CSV.
+
+    `start` must be a record start and defaults to the first row after the
+    header. A chunk never ends inside a quoted field. The trailing newline
+    of each chunk is removed.
+    """
+    _, data_start = read_header(path)
+    size = os.path.getsize(path)
+    start = data_start if start is None else start
+    end = size if end is None else min(end, size)
+    if start >= end:
+        return
+
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        pos = start
+        while pos < end:
+            # Extend the block to the end of the line it stops in, and on to
+            # the end of the record if a quoted field spans that newline
+            limit = pos + block_size
+            if limit < end:
+                nl = mm.find(b'\n', limit - 1, end)
+                stop = end if nl == -1 else nl + 1
+            else:
+                stop = end
+            chunk = mm[pos:stop]
+            if stop < end and b'"' in chunk and _open_quote(chunk) >= 0:
+                stop = _record_end(mm, stop, end)
+                chunk = mm[pos:stop]
+            pos = stop
+            if chunk.endswith(b'\n'):
+                chunk = chunk[:-1]
+            yield chunk
+
+
+def record_starts(path: str, start: int, positions: Sequence[int],
+                  block_size: int = BLOCK_SIZE) -> List[int]:
+    """Return, for each byte offset in positions (ascending), the first record start at or after it.
+
+    `start` must be a record start. Without quotes in the file this is the
+    next line start. Otherwise the quote state is tracked from `start` one
+    line-aligned block at a time (only blocks with quotes are inspected),
+    and lines that begin inside a quoted field are skipped.
+    """
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        size = len(mm)
+        has_quotes = mm.find(b'"', start) != -1
+        bounds = []
+        scanned, quoted = start, False
+        for pos in positions:
+            if pos <= scanned:
+                bounds.append(scanned)
+                continue
+            nl = mm.find(b'\n', pos - 1)
+            line_start = size if nl == -1 else nl + 1
+            if has_quotes:
+                # Quote state at line_start, from the last record start
+                while scanned < line_start:
+                    stop = min(scanned + block_size, line_start)
+                    if stop < line_start:
+                        nl = mm.find(b'\n', stop - 1, line_start)
+                        stop = line_start if nl == -1 else nl + 1
+                    block = mm[scanned:stop]
+                    if b'"' in block:
+                        quoted = _open_quote(block, quoted) >= 0
+                    scanned = stop
+                if quoted:
+                    line_start = _record_end(mm, line_start, size)
+                scanned, quoted = line_start, False
+            bounds.append(line_start)
+    return bounds
+
+
+def iter_row_blocks(path: str, start: Optional[int] = None, end: Optional[int] = None,
+                    block_size: int = BLOCK_SIZE) -> Iterator[List[List[bytes]]]:
+    """Yield the data rows block by block, each row as a list of raw byte cells.
+
+    Blank lines are skipped; quoted records are parsed with the csv module.
+    Memory is bounded by the block size.
+    """
+    for chunk in _iter_chunks(path, start, end, block_size):
+        yield _split_rows(chunk)
+
+
+# Every byte except the field and record separators (for bytes.translate's delete)
+_NOT_SEPARATOR = bytes(b for b in range(256) if b not in b',\n')
+
+
+def _block_columns(chunk: bytes, indices: Sequence[int], ncols: int) -> Tuple[int, List[array]]:
+    """Return (number of rows, one array('d') per requested column) for a chunk of lines."""
+    nlines = chunk.count(b'\n') + 1
+    # Only the separators left, every line must read as exactly ncols - 1 commas
+    if (b'"' not in chunk and chunk.translate(None, _NOT_SEPARATOR)
+            == (b',' * (ncols - 1) + b'\n') * (nlines - 1) + b',' * (ncols - 1)):
+        # Every line has exactly ncols fields: split the whole block
+        # at once and take each column as a strided slice
+        flat = chunk.replace(b'\n', b',').split(b',')
+        column_cells = [flat[idx::ncols] for idx in indices]
+        nrows = nlines
+    else:
+        rows = _split_rows(chunk)
+        column_cells = [[row[idx] for row in rows if len(row) > idx] for idx in indices]
+        nrows = len(rows)
+    return nrows, [cells_to_array(cells) for cells in column_cells]
+
+
+def iter_numeric_blocks(path: str, columns: Sequence[Column],
+                        start: Optional[int] = None, end: Optional[int] = None,
+                        block_size: int = BLOCK_SIZE) -> Iterator[List[array]]:
+    """Yield, block by block, the numeric values of the requested columns.
+
+    Each item is a list with one array('d') per requested column (in the
+    order given), holding that block's values. `start`/`end` restrict the
+    scan to a byte range of data rows; `start` must be a record start and
+    defaults to the first row after the header. Memory is bounded by the
+    block size.
+    """
+    header, _ = read_header(path)
+    indices = _resolve_columns(header, columns)
+    ncols = len(header)
+
+    for chunk in _iter_chunks(path, start, end, block_size):
+        yield _block_columns(chunk, indices, ncols)[1]
+
+
+def iter_stream_blocks(stream: BinaryIO, columns: Sequence[Column],
+                       block_size: int = BLOCK_SIZE) -> Iterator[Tuple[int, List[array]]]:
+    """Like iter_numeric_blocks, but reading a binary stream (e.g. sys.stdin.buffer).
+
+    The header is taken from the first line of the stream. Each item is
+    (rows in the block, one array('d') per requested column). The stream
+    is read block_size bytes at a time, so memory stays constant however
+    long it is; a record whose quoted field spans a block boundary is
+    carried over whole into the next block.
+    """
+    header = _parse_header(stream.readline())
+    indices = _resolve_columns(header, columns)
+    ncols = len(header)
+
+    carry = b''
+    while True:
+        data = stream.read(block_size)
+        if not data:
+            break
+        buf = carry + data
+        cut = buf.rfind(b'\n')
+        if cut != -1 and b'"' in buf:
+            # Cut before the record whose quoted field spans that newline
+            opened = _open_quote(buf[:cut])
+            if opened >= 0:
+                cut = buf.rfind(b'\n', 0, opened)
+        if cut == -1:
+            carry = buf
+            continue
+        carry = buf[cut + 1:]
+        yield _block_columns(buf[:cut], indices, ncols)
+    if carry.strip():
+        yield _block_columns(carry, indices, ncols)
+
+
+def scan_numeric_columns(path: str, columns: Sequence[Column],
+                         as_numpy: bool = False) -> Dict[Column, object]:
+    """Return {column: values} for the requested numeric columns of a CSV.
+
+    Values are array('d') buffers, or NumPy float64 arrays sharing the same
+    memory when as_numpy is True. Blank and non-numeric cells are skipped.
+    """
+    result = {col: array('d') for col in columns}
+    for block in iter_numeric_blocks(path, columns):
+        for col, values in zip(columns, block):
+            result[col].extend(values)
+    if as_numpy:
+        import numpy as np
+        return {col: np.frombuffer(values, dtype=np.float64) for col, values in result.items()}
+    return result
+
+
+def _dictreader_columns(path: str, columns: Sequence[str]) -> Dict[str, List[float]]:
+    """Reference implementation with csv.DictReader, used by the benchmark."""
+    result: Dict[str, List[float]] = {col: [] for col in columns}
+    with open(path, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            for col in columns:
+                try:
+                    result[col].append(float(row[col]))
+                except (ValueError, TypeError):
+                    continue
+    return result
+
+
+def write_benchmark_csv(path: str, size_mb: int) -> None:
+    """Write a CSV of roughly size_mb megabytes with an id, a name and three numeric columns."""
+    rng = random.Random(0)
+    target = size_mb * 1024 * 1024
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        f.write('Id,Name,Age,Score,Value\n')
+        written = 0
+        i = 0
+        while written < target:
+            lines = []
+            for _ in range(10000):
+                lines.append(f'{i},user{i % 1000},{rng.randint(18, 90)},'
+                             f'{rng.random() * 100:.3f},{rng.gauss(0, 1):.6f}\n')
+                i += 1
+            text = ''.join(lines)
+            f.write(text)
+            written += len(text)
+
+
+def benchmark(path: Optional[str] = None, size_mb: int = 1024) -> None:
+    """Compare scan_numeric_columns with csv.DictReader on a large CSV."""
+    columns = ['Age', 'Score', 'Value']
+    tmp = None
+    if path is None:
+        fd, tmp = tempfile.mkstemp(suffix='.csv')
+        os.close(fd)
+        print(f'Writing {size_mb} MB benchmark CSV to {tmp} ...')
+        write_benchmark_csv(tmp, size_mb)
+        path = tmp
+    try:
+        size = os.path.getsize(path) / (1024 * 1024)
+        start = time.perf_counter()
+        fast = scan_numeric_columns(path, columns)
+        fast_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        slow = _dictreader_columns(path, columns)
+        slow_time = time.perf_counter() - start
+
+        cells = sum(len(v) for v in fast.values())
+        assert cells == sum(len(v) for v in slow.values())
+        print(f'{size:.0f} MB, {cells} numeric cells')
+        print(f'  csv.DictReader: {slow_time:8.2f} s ({cells / slow_time / 1e6:.2f}M cells/s)')
+        print(f'  mmap scanner:   {fast_time:8.2f} s ({cells / fast_time / 1e6:.2f}M cells/s, '
+              f'{slow_time / fast_time:.1f}x)')
+    finally:
+        if tmp is not None:
+            os.remove(tmp)
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description='Benchmark the mmap CSV scanner against csv.DictReader')
+    parser.add_argument('--benchmark', action='store_true', help='Run the benchmark')
+    parser.add_argument('--file', metavar='CSV_FILE',
+                        help='Benchmark on an existing CSV with Age, Score and Value columns')
+    parser.add_argument('--size-mb', type=int, default=1024,
+                        help='Size of the generated benchmark CSV (default: 1024)')
+    args = parser.parse_args(argv)
+
+    if not args.benchmark:
+        parser.print_help()
+        return 0
+    benchmark(args.file, args.size_mb)
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -4,13 +4,62 @@
 This script will create a default `data.csv` in the same folder as the
 script (Name,Age,Score) if the file doesn't exist. It then reads the
 CSV and prints mean, min and max for each numeric column.
+
+Rows are streamed: each column keeps a running accumulator (count, Welford
+mean/variance, min, max), so memory is proportional to the number of
+columns rather than the size of the file. With --jobs N the file is split
+into N record-aligned byte ranges that are processed in worker processes and
+merged exactly. Numeric cells are extracted by the memory-mapped byte
+scanner in csv_scan.py rather than csv.DictReader.
+
+With --quantiles sketch each column also keeps a mergeable t-digest and
+p50/p90/p99 are reported in bounded memory; --quantiles exact keeps every
+value instead, for small files or for checking the sketch.
+
+With --cache the parsed columns are stored as raw float64 files (see
+csv_cache.py) and later runs on the unchanged file memory-map them instead
+of parsing the text again.
+
+With --group-by COL the same statistics are reported per distinct value of
+COL (optionally cut to a prefix or binned into numeric buckets), still in
+one streaming pass. Past --max-groups groups in memory the aggregates are
+spilled to hash-partitioned temporary files and merged at the end.
 """
 
+import argparse
+import bisect
 import csv
+import math
 import os
+import pickle
+import shutil
 import sys
-from statistics import mean
-from typing import Dict, Any
+import tempfile
+import zlib
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from csv_cache import DEFAULT_CACHE_DIR, ColumnCache
+from csv_scan import cells_to_array, iter_numeric_blocks, iter_row_blocks, read_header, record_starts
+
+try:
+    import numpy as np
+except ImportError:  # block statistics fall back to pure Python
+    np = None
+
+# Quantiles reported when quantile tracking is enabled
+QUANTILES = (0.5, 0.9, 0.99)
+
+# Values per column handed to the accumulators at a time when reading from the cache
+CACHED_BLOCK_LEN = 1 << 20
+
+# Groups held in memory per process before group-by aggregates spill to disk
+DEFAULT_MAX_GROUPS = 100_000
+
+# Number of hash partitions spilled groups are spread over
+SPILL_PARTITIONS = 16
 
 
 def write_sample_csv(path: str) -> None:
@@ -32,52 +81,696 @@ def write_sample_csv(path: str) -> None:
         writer.writerows(rows)
 
 
-def read_csv_stats(path: str) -> Dict[str, Dict[str, float]]:
-    """Return mean/min/max for numeric columns in the CSV at `path`.
+class RunningStats:
+    """Running count, mean, variance (Welford's method), min and max of a column."""
+
+    __slots__ = ('count', 'mean', 'm2', 'min', 'max')
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0  # sum of squared differences from the mean
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, x: float) -> None:
+        """Fold one value into the accumulator."""
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (x - self.mean)
+        if x < self.min:
+            self.min = x
+        if x > self.max:
+            self.max = x
+
+    def add_block(self, values: array) -> None:
+        """Fold a whole block of values in: summarise it, then merge."""
+        n = len(values)
+        if n == 0:
+            return
+        block = RunningStats()
+        block.count = n
+        if np is not None:
+            a = np.frombuffer(values, dtype=np.float64)
+            block.mean = float(a.mean())
+            block.m2 = float(np.dot(a - block.mean, a - block.mean))
+            block.min = float(a.min())
+            block.max = float(a.max())
+        else:
+            block.mean = math.fsum(values) / n
+            block.m2 = math.fsum((x - block.mean) ** 2 for x in values)
+            block.min = min(values)
+            block.max = max(values)
+        self.merge(block)
+
+    def merge(self, other: 'RunningStats') -> None:
+        """Fold another accumulator in (parallel form of Welford's update)."""
+        if other.count == 0:
+            return
+        if self.count == 0:
+            self.count, self.mean, self.m2 = other.count, other.mean, other.m2
+            self.min, self.max = other.min, other.max
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
 
-    Non-numeric cells are ignored.
+    def state(self) -> Tuple[int, float, float, float, float]:
+        """Return the accumulator as a plain tuple, cheap to send between processes."""
+        return (self.count, self.mean, self.m2, self.min, self.max)
+
+    @classmethod
+    def from_state(cls, state: Sequence[float]) -> 'RunningStats':
+        """Rebuild an accumulator from state()."""
+        acc = cls()
+        acc.count, acc.mean, acc.m2, acc.min, acc.max = state
+        return acc
+
+    def result(self) -> Dict[str, float]:
+        """Return mean/min/max plus sample variance and standard deviation."""
+        variance = self.m2 / (self.count - 1) if self.count > 1 else 0.0
+        return {
+            'mean': self.mean,
+            'min': self.min,
+            'max': self.max,
+            'variance': variance,
+            'stddev': math.sqrt(variance),
+        }
+
+
+class TDigest:
+    """Mergeable t-digest sketch for approximate quantiles in bounded memory.
+
+    Values are buffered and periodically compressed into roughly
+    `compression` / 2 centroids. The k1 scale function keeps centroids small
+    near the tails, so the rank error is about 1/compression and tail
+    quantiles such as p99 are more precise than the median.
     """
-    if not os.path.exists(path):
-        raise FileNotFoundError(path)
 
-    numeric: Dict[str, list[float]] = {}
-    with open(path, newline='', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            for k, v in row.items():
-                if v is None:
-                    continue
-                s = v.strip()
-                if s == '':
-                    continue
-                try:
-                    val = float(s)
-                except ValueError:
-                    continue
-                numeric.setdefault(k, []).append(val)
+    def __init__(self, compression: float = 100.0) -> None:
+        self.compression = compression
+        self.means: List[float] = []
+        self.weights: List[float] = []
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+        self._buffer = array('d')
+        self._buffer_limit = max(1000, int(10 * compression))
+
+    def add_block(self, values: array) -> None:
+        """Add a block of values; compress once the buffer is full."""
+        if len(values) == 0:
+            return
+        self._buffer.extend(values)
+        self.count += len(values)
+        self.min = min(self.min, min(values))
+        self.max = max(self.max, max(values))
+        if len(self._buffer) >= self._buffer_limit:
+            self._compress()
+
+    def merge(self, other: 'TDigest') -> None:
+        """Fold another digest's centroids into this one."""
+        other._compress()
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress(other.means, other.weights)
+
+    def _compress(self, extra_means: Sequence[float] = (),
+                  extra_weights: Sequence[float] = ()) -> None:
+        """Merge buffered points and extra centroids into the centroid list.
+
+        Points are sorted and grouped by which unit interval of the scale
+        function k(q) = compression / (2 pi) * asin(2q - 1) the middle of
+        their cumulative weight falls into.
+        """
+        if not self._buffer and not extra_means:
+            return
+        offset = self.compression / 4  # k(0) == -compression / 4
+        scale = self.compression / (2 * math.pi)
+
+        if np is not None:
+            means = np.concatenate([np.asarray(self.means, dtype=np.float64),
+                                    np.frombuffer(self._buffer, dtype=np.float64),
+                                    np.asarray(extra_means, dtype=np.float64)])
+            weights = np.concatenate([np.asarray(self.weights, dtype=np.float64),
+                                      np.ones(len(self._buffer)),
+                                      np.asarray(extra_weights, dtype=np.float64)])
+            order = np.argsort(means, kind='stable')
+            means, weights = means[order], weights[order]
+            mid = (np.cumsum(weights) - weights / 2) / weights.sum()
+            ids = np.floor(scale * np.arcsin(2 * mid - 1) + offset).astype(np.int64)
+            ids -= ids[0]
+            bucket_weights = np.bincount(ids, weights)
+            bucket_sums = np.bincount(ids, weights * means)
+            used = bucket_weights > 0
+            self.means = (bucket_sums[used] / bucket_weights[used]).tolist()
+            self.weights = bucket_weights[used].tolist()
+        else:
+            points = sorted(zip(
+                self.means + list(self._buffer) + list(extra_means),
+                self.weights + [1.0] * len(self._buffer) + list(extra_weights),
+            ))
+            total = math.fsum(w for _, w in points)
+            new_means: List[float] = []
+            new_weights: List[float] = []
+            cumulative = 0.0
+            current_id = None
+            for mean, weight in points:
+                mid = (cumulative + weight / 2) / total
+                cumulative += weight
+                bucket = math.floor(scale * math.asin(max(-1.0, min(1.0, 2 * mid - 1))) + offset)
+                if bucket == current_id:
+                    new_weights[-1] += weight
+                    new_means[-1] += (mean - new_means[-1]) * weight / new_weights[-1]
+                else:
+                    new_means.append(mean)
+                    new_weights.append(weight)
+                    current_id = bucket
+            self.means, self.weights = new_means, new_weights
+
+        self._buffer = array('d')
+
+    def quantiles(self, qs: Sequence[float]) -> List[float]:
+        """Return approximate quantiles, interpolating between centroid centres."""
+        self._compress()
+        if not self.count:
+            return [math.nan] * len(qs)
+        centres = []
+        cumulative = 0.0
+        for w in self.weights:
+            centres.append(cumulative + w / 2)
+            cumulative += w
+
+        result = []
+        for q in qs:
+            target = q * self.count
+            if target <= centres[0]:
+                # Between the minimum and the first centroid
+                frac = target / centres[0] if centres[0] else 0.0
+                result.append(self.min + (self.means[0] - self.min) * frac)
+            elif target >= centres[-1]:
+                # Between the last centroid and the maximum
+                tail = self.count - centres[-1]
+                frac = (target - centres[-1]) / tail if tail else 0.0
+                result.append(self.means[-1] + (self.max - self.means[-1]) * frac)
+            else:
+                i = bisect.bisect_right(centres, target) - 1
+                frac = (target - centres[i]) / (centres[i + 1] - centres[i])
+                result.append(self.means[i] + (self.means[i + 1] - self.means[i]) * frac)
+        return result
+
+    def state(self) -> Tuple:
+        """Return the digest as plain data, cheap to send between processes."""
+        self._compress()
+        return (self.compression, self.means, self.weights, self.count, self.min, self.max)
+
+    @classmethod
+    def from_state(cls, state: Sequence) -> 'TDigest':
+        """Rebuild a digest from state()."""
+        compression, means, weights, count, lo, hi = state
+        digest = cls(compression)
+        digest.means, digest.weights = list(means), list(weights)
+        digest.count, digest.min, digest.max = count, lo, hi
+        return digest
+
+
+class ExactQuantiles:
+    """Keeps every value so quantiles are exact; meant for small files and tests."""
+
+    def __init__(self) -> None:
+        self.values = array('d')
+
+    def add_block(self, values: array) -> None:
+        """Add a block of values."""
+        self.values.extend(values)
+
+    def merge(self, other: 'ExactQuantiles') -> None:
+        """Fold another collector's values into this one."""
+        self.values.extend(other.values)
+
+    def quantiles(self, qs: Sequence[float]) -> List[float]:
+        """Return quantiles with linear interpolation between closest ranks."""
+        ordered = sorted(self.values)
+        n = len(ordered)
+        if n == 0:
+            return [math.nan] * len(qs)
+        result = []
+        for q in qs:
+            pos = q * (n - 1)
+            lo = math.floor(pos)
+            hi = min(lo + 1, n - 1)
+            result.append(ordered[lo] + (ordered[hi] - ordered[lo]) * (pos - lo))
+        return result
+
+    def state(self) -> array:
+        """Return the collected values."""
+        return self.values
+
+    @classmethod
+    def from_state(cls, state: array) -> 'ExactQuantiles':
+        """Rebuild a collector from state()."""
+        collector = cls()
+        collector.values = array('d', state)
+        return collector
+
+
+def _new_sketch(quantiles: Optional[str], compression: float):
+    """Return the quantile tracker for the requested mode (None when disabled)."""
+    if quantiles is None:
+        return None
+    if quantiles == 'sketch':
+        return TDigest(compression)
+    if quantiles == 'exact':
+        return ExactQuantiles()
+    raise ValueError("quantiles must be None, 'sketch' or 'exact'")
+
+
+def _sketch_from_state(quantiles: str, state):
+    """Rebuild a quantile tracker of the given mode from its state()."""
+    return TDigest.from_state(state) if quantiles == 'sketch' else ExactQuantiles.from_state(state)
+
+
+def _split_ranges(path: str, start: int, jobs: int) -> List[Tuple[int, int]]:
+    """Split [start, file size) into up to `jobs` byte ranges aligned on record starts.
+
+    A boundary never falls inside a quoted field, even one spanning lines.
+    """
+    size = os.path.getsize(path)
+    targets = [start + (size - start) * i // jobs for i in range(1, jobs)]
+    bounds = [start] + record_starts(path, start, targets) + [size]
+    return [(lo, hi) for lo, hi in zip(bounds, bounds[1:]) if lo < hi]
+
+
+def _accumulate(blocks: Iterable[Sequence], ncols: int, quantiles: Optional[str],
+                compression: float) -> List[Optional[Tuple]]:
+    """Fold blocks of per-column values into accumulators.
+
+    Returns one (stats state, sketch state) pair per column (None for
+    columns without numeric values).
+    """
+    columns = [RunningStats() for _ in range(ncols)]
+    sketches = [_new_sketch(quantiles, compression) for _ in range(ncols)]
+    for block in blocks:
+        for acc, sketch, values in zip(columns, sketches, block):
+            acc.add_block(values)
+            if sketch is not None:
+                sketch.add_block(values)
+    return [
+        (acc.state(), sketch.state() if sketch is not None else None) if acc.count else None
+        for acc, sketch in zip(columns, sketches)
+    ]
+
+
+def _stats_for_range(path: str, start: int, end: int, ncols: int,
+                     quantiles: Optional[str] = None,
+                     compression: float = 100.0) -> List[Optional[Tuple]]:
+    """Accumulate every numeric column over one byte range of the CSV (worker process)."""
+    blocks = iter_numeric_blocks(path, range(ncols), start, end)
+    return _accumulate(blocks, ncols, quantiles, compression)
+
+
+def _cached_blocks(columns: Sequence[memoryview]) -> Iterator[List[memoryview]]:
+    """Yield zero-copy slices of cached columns, CACHED_BLOCK_LEN values at a time."""
+    longest = max((len(values) for values in columns), default=0)
+    for lo in range(0, longest, CACHED_BLOCK_LEN):
+        yield [values[lo:lo + CACHED_BLOCK_LEN] for values in columns]
 
+
+def _column_results(names: Sequence[str], columns: Sequence[Optional[RunningStats]],
+                    sketches: Sequence, quantiles: Optional[str]) -> Dict[str, Dict[str, float]]:
+    """Turn per-column accumulators into the {column: statistics} result dict."""
     stats: Dict[str, Dict[str, float]] = {}
-    for col, vals in numeric.items():
-        if not vals:
+    for name, acc, sketch in zip(names, columns, sketches):
+        if acc is None or not acc.count:
             continue
-        stats[col] = {
-            'mean': mean(vals),
-            'min': min(vals),
-            'max': max(vals),
-        }
+        stats[name] = acc.result()
+        if sketch is not None:
+            for q, value in zip(QUANTILES, sketch.quantiles(QUANTILES)):
+                stats[name][f'p{round(q * 100)}'] = value
     return stats
 
 
-def main() -> int:
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    csv_path = os.path.join(script_dir, 'data.csv')
+def _prefix_key(length: int, key: str) -> str:
+    return key[:length]
+
+
+def _bucket_key(width: float, key: str) -> str:
+    try:
+        value = float(key)
+    except ValueError:
+        return key
+    return f'{math.floor(value / width) * width:g}'
+
+
+def prefix_grouping(length: int) -> Callable[[str], str]:
+    """Group key function keeping the first `length` characters of the value."""
+    return partial(_prefix_key, length)
+
+
+def bucket_grouping(width: float) -> Callable[[str], str]:
+    """Group key function binning numbers into [k*width, (k+1)*width), labelled k*width.
+
+    Non-numeric values are kept as their own groups.
+    """
+    if width <= 0:
+        raise ValueError('bucket width must be positive')
+    return partial(_bucket_key, width)
+
+
+def _group_sort_key(key: str) -> Tuple:
+    """Order numeric group keys numerically, before any text keys."""
+    try:
+        return (0, float(key), key)
+    except ValueError:
+        return (1, 0.0, key)
+
+
+class GroupTable:
+    """Hash map of group key -> per-column running aggregates that spills to disk.
+
+    Once more than max_groups keys are held, the state of every group is
+    appended to one of SPILL_PARTITIONS pickle files in spill_dir, picked by
+    a stable hash of the key, and the table starts over empty. Partial
+    aggregates of one key therefore always land in the same partition, and
+    results() can merge the spilled data one partition at a time.
+    """
+
+    def __init__(self, ncols: int, quantiles: Optional[str], compression: float,
+                 max_groups: int, spill_dir: str) -> None:
+        self.ncols = ncols
+        self.quantiles = quantiles
+        self.compression = compression
+        self.max_groups = max_groups
+        self.spill_dir = spill_dir
+        self.groups: Dict[str, List[Tuple[RunningStats, object]]] = {}
+        self.spill_files: Dict[int, List[str]] = {}
+
+    def _accumulators(self, key: str, spill: bool = True) -> List[Tuple[RunningStats, object]]:
+        accs = self.groups.get(key)
+        if accs is None:
+            if spill and len(self.groups) >= self.max_groups:
+                self.spill()
+            accs = [(RunningStats(), _new_sketch(self.quantiles, self.compression))
+                    for _ in range(self.ncols)]
+            self.groups[key] = accs
+        return accs
+
+    def add_block(self, key: str, block: Sequence) -> None:
+        """Fold one block of per-column values into the group `key`."""
+        for (acc, sketch), values in zip(self._accumulators(key), block):
+            if len(values):
+                acc.add_block(values)
+                if sketch is not None:
+                    sketch.add_block(values)
+
+    def merge_states(self, key: str, states: Sequence[Optional[Tuple]], spill: bool = True) -> None:
+        """Fold a group's state (as produced by state()) into the group `key`."""
+        accs = self._accumulators(key, spill)
+        for (acc, sketch), pair in zip(accs, states):
+            if pair is None:
+                continue
+            stats_state, sketch_state = pair
+            acc.merge(RunningStats.from_state(stats_state))
+            if sketch_state is not None:
+                sketch.merge(_sketch_from_state(self.quantiles, sketch_state))
+
+    @staticmethod
+    def _group_state(accs: Sequence[Tuple[RunningStats, object]]) -> List[Optional[Tuple]]:
+        return [
+            (acc.state(), sketch.state() if sketch is not None else None) if acc.count else None
+            for acc, sketch in accs
+        ]
+
+    def spill(self) -> None:
+        """Append every in-memory group to its partition file and empty the table."""
+        files = {}
+        try:
+            for key, accs in self.groups.items():
+                part = zlib.crc32(key.encode('utf-8')) % SPILL_PARTITIONS
+                f = files.get(part)
+                if f is None:
+                    fd, name = tempfile.mkstemp(prefix=f'part{part}_', suffix='.pkl',
+                                                dir=self.spill_dir)
+                    f = files[part] = os.fdopen(fd, 'wb')
+                    self.spill_files.setdefault(part, []).append(name)
+                pickle.dump((key, self._group_state(accs)), f, protocol=pickle.HIGHEST_PROTOCOL)
+        finally:
+            for f in files.values():
+                f.close()
+        self.groups.clear()
+
+    def state(self) -> Tuple[Dict[str, List[Optional[Tuple]]], Dict[int, List[str]]]:
+        """Return (in-memory group states, spill files), cheap to send between processes."""
+        return {key: self._group_state(accs) for key, accs in self.groups.items()}, self.spill_files
+
+    def absorb(self, state: Tuple[Dict[str, List[Optional[Tuple]]], Dict[int, List[str]]]) -> None:
+        """Merge another table's state() into this one."""
+        groups, spill_files = state
+        for key, states in groups.items():
+            self.merge_states(key, states)
+        for part, names in spill_files.items():
+            self.spill_files.setdefault(part, []).extend(names)
+
+    def _merged_groups(self) -> Iterator[Tuple[str, List[Tuple[RunningStats, object]]]]:
+        """Yield (key, accumulators) for every group, merging spilled partitions."""
+        if not self.spill_files:
+            yield from self.groups.items()
+            return
+        self.spill()
+        spilled, self.spill_files = self.spill_files, {}
+        for part in sorted(spilled):
+            for name in spilled[part]:
+                with open(name, 'rb') as f:
+                    while True:
+                        try:
+                            key, states = pickle.load(f)
+                        except EOFError:
+                            break
+                        # A single partition may exceed the budget; it is not split further
+                        self.merge_states(key, states, spill=False)
+                os.remove(name)
+            yield from self.groups.items()
+            self.groups.clear()
+
+    def results(self, names: Sequence[str]) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """Return {group: {column: statistics}}, groups in sorted order."""
+        out = {}
+        for key, accs in self._merged_groups():
+            stats = _column_results(names, [acc for acc, _ in accs],
+                                    [sketch for _, sketch in accs], self.quantiles)
+            if stats:
+                out[key] = stats
+        return dict(sorted(out.items(), key=lambda item: _group_sort_key(item[0])))
+
 
-    if not os.path.exists(csv_path):
-        write_sample_csv(csv_path)
-        print(f'Wrote sample CSV to: {csv_path}')
+def _group_stats_for_range(path: str, start: int, end: int, ncols: int, group_index: int,
+                           group_key: Optional[Callable[[str], str]], quantiles: Optional[str],
+                           compression: float, max_groups: int, spill_dir: str) -> Tuple:
+    """Accumulate per-group statistics over one byte range of the CSV (worker process).
 
+    Returns GroupTable.state(); groups spilled by this worker are passed on
+    as file names in the shared spill directory.
+    """
+    value_indices = [i for i in range(ncols) if i != group_index]
+    table = GroupTable(len(value_indices), quantiles, compression, max_groups, spill_dir)
+    for rows in iter_row_blocks(path, start, end):
+        # Gather each group's rows for the block, then convert column by column
+        buckets: Dict[bytes, List[List[bytes]]] = {}
+        for row in rows:
+            raw = row[group_index] if len(row) > group_index else b''
+            bucket = buckets.get(raw)
+            if bucket is None:
+                buckets[raw] = [row]
+            else:
+                bucket.append(row)
+        for raw, group_rows in buckets.items():
+            key = raw.strip().decode('utf-8', 'replace')
+            if group_key is not None:
+                key = group_key(key)
+            table.add_block(key, [cells_to_array([row[i] for row in group_rows if len(row) > i])
+                                  for i in value_indices])
+    return table.state()
+
+
+def _read_group_stats(path: str, header: List[str], data_start: int, group_by: str,
+                      group_key: Optional[Callable[[str], str]], jobs: int,
+                      quantiles: Optional[str], compression: float,
+                      max_groups: int) -> Dict[str, Dict[str, Dict[str, float]]]:
+    """Group-by branch of read_csv_stats."""
+    if group_by not in header:
+        raise KeyError(f"Column '{group_by}' not found in CSV")
+    if max_groups < 1:
+        raise ValueError('max_groups must be at least 1')
+    group_index = header.index(group_by)
+    ncols = len(header)
+    ranges = _split_ranges(path, data_start, jobs)
+
+    spill_dir = tempfile.mkdtemp(prefix='csv_groups_')
     try:
-        stats = read_csv_stats(csv_path)
+        args = (ncols, group_index, group_key, quantiles, compression, max_groups, spill_dir)
+        if len(ranges) <= 1:
+            partials = [_group_stats_for_range(path, lo, hi, *args) for lo, hi in ranges]
+        else:
+            with ProcessPoolExecutor(max_workers=len(ranges)) as pool:
+                futures = [pool.submit(_group_stats_for_range, path, lo, hi, *args)
+                           for lo, hi in ranges]
+                partials = [future.result() for future in futures]
+
+        table = GroupTable(ncols - 1, quantiles, compression, max_groups, spill_dir)
+        for state in partials:
+            table.absorb(state)
+        return table.results([name for i, name in enumerate(header) if i != group_index])
+    finally:
+        shutil.rmtree(spill_dir, ignore_errors=True)
+
+
+def read_csv_stats(path: str, jobs: int = 1, quantiles: Optional[str] = None,
+                   compression: float = 100.0,
+                   cache: Optional[ColumnCache] = None,
+                   group_by: Optional[str] = None,
+                   group_key: Optional[Callable[[str], str]] = None,
+                   max_groups: int = DEFAULT_MAX_GROUPS) -> Dict:
+    """Return mean/min/max/variance/stddev for numeric columns in the CSV at `path`.
+
+    The file is read in a single streaming pass. Non-numeric cells are
+    ignored. Variance is the sample variance (0.0 for a single value).
+
+    With jobs > 1 the data rows are split into record-aligned byte ranges that
+    are processed in parallel worker processes; the per-column partial
+    aggregates are merged exactly, so the result matches jobs=1 up to
+    floating-point rounding.
+
+    quantiles='sketch' adds p50/p90/p99 from a t-digest per column (rank
+    error about 1/compression); quantiles='exact' computes them from every
+    value, which needs memory proportional to the file.
+
+    With a ColumnCache, parsed columns are stored on the first run and
+    memory-mapped on later runs over the unchanged file (jobs is then unused).
+
+    With group_by, the result is {group: {column: statistics}} for every
+    distinct value of that column (other columns only), in sorted order.
+    group_key maps the raw value to its group, e.g. prefix_grouping(1) or
+    bucket_grouping(10); it must be picklable when jobs > 1. At most
+    max_groups groups are kept in memory per process; beyond that the
+    aggregates are spilled to temporary files and merged at the end. The
+    cache is not used for grouped statistics.
+    """
+    if not os.path.exists(path):
+        raise FileNotFoundError(path)
+    if jobs < 1:
+        raise ValueError('jobs must be at least 1')
+    _new_sketch(quantiles, compression)  # validate the mode up front
+
+    header, data_start = read_header(path)
+    if not header:
+        return {}
+    if group_by is not None:
+        return _read_group_stats(path, header, data_start, group_by, group_key, jobs,
+                                 quantiles, compression, max_groups)
+    ncols = len(header)
+    ranges = _split_ranges(path, data_start, jobs)
+
+    if cache is not None:
+        cached = cache.get_columns(path, range(ncols))
+        blocks = _cached_blocks([cached[i] for i in range(ncols)])
+        partials = [_accumulate(blocks, ncols, quantiles, compression)]
+    elif len(ranges) <= 1:
+        partials = [_stats_for_range(path, lo, hi, ncols, quantiles, compression)
+                    for lo, hi in ranges]
+    else:
+        n = len(ranges)
+        with ProcessPoolExecutor(max_workers=n) as pool:
+            partials = list(pool.map(_stats_for_range, [path] * n,
+                                     [lo for lo, _ in ranges], [hi for _, hi in ranges],
+                                     [ncols] * n, [quantiles] * n, [compression] * n))
+
+    columns: List[Optional[RunningStats]] = [None] * ncols
+    sketches: List = [None] * ncols
+    for partial in partials:
+        for i, pair in enumerate(partial):
+            if pair is None:
+                continue
+            state, sketch_state = pair
+            if columns[i] is None:
+                columns[i] = RunningStats.from_state(state)
+            else:
+                columns[i].merge(RunningStats.from_state(state))
+            if sketch_state is not None:
+                sketch = _sketch_from_state(quantiles, sketch_state)
+                if sketches[i] is None:
+                    sketches[i] = sketch
+                else:
+                    sketches[i].merge(sketch)
+
+    return _column_results(header, columns, sketches, quantiles)
+
+
+def print_stats(stats: Dict[str, Dict[str, float]], indent: str = '') -> None:
+    """Print mean, min, max and standard deviation (plus quantiles) for each column."""
+    for col, s in stats.items():
+        line = (f"{indent}{col}: mean={s['mean']:.2f}, min={s['min']:.2f}, max={s['max']:.2f}, "
+                f"stddev={s['stddev']:.2f}")
+        if 'p50' in s:
+            line += f", p50={s['p50']:.2f}, p90={s['p90']:.2f}, p99={s['p99']:.2f}"
+        print(line)
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description='Print mean, min, max and stddev for numeric CSV columns'
+    )
+    parser.add_argument('path', nargs='?',
+                        help='CSV file (default: data.csv next to this script, '
+                             'created with sample data if missing)')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='Number of worker processes (default: 1)')
+    parser.add_argument('-q', '--quantiles', choices=['sketch', 'exact'],
+                        help='Also report p50/p90/p99, from a t-digest sketch or exactly')
+    parser.add_argument('--compression', type=float, default=100.0,
+                        help='t-digest compression; rank error is about 1/compression (default: 100)')
+    parser.add_argument('--cache', nargs='?', const=DEFAULT_CACHE_DIR, metavar='DIR',
+                        help=f'Cache parsed columns on disk (default dir: {DEFAULT_CACHE_DIR})')
+    parser.add_argument('-g', '--group-by', metavar='COL',
+                        help='Report the statistics separately for each value of COL')
+    grouping = parser.add_mutually_exclusive_group()
+    grouping.add_argument('--group-prefix', type=int, metavar='N',
+                          help='Group by the first N characters of the --group-by value')
+    grouping.add_argument('--group-bucket', type=float, metavar='WIDTH',
+                          help='Group numeric --group-by values into buckets of WIDTH')
+    parser.add_argument('--max-groups', type=int, default=DEFAULT_MAX_GROUPS,
+                        help='Groups kept in memory before spilling to disk '
+                             f'(default: {DEFAULT_MAX_GROUPS})')
+    args = parser.parse_args(argv)
+    if (args.group_prefix is not None or args.group_bucket is not None) and not args.group_by:
+        parser.error('--group-prefix and --group-bucket require --group-by')
+
+    if args.path:
+        csv_path = args.path
+    else:
+        script_dir = os.path.dirname(os.path.abspath(__file__))
+        csv_path = os.path.join(script_dir, 'data.csv')
+        if not os.path.exists(csv_path):
+            write_sample_csv(csv_path)
+            print(f'Wrote sample CSV to: {csv_path}')
+
+    group_key = None
+    if args.group_prefix is not None:
+        group_key = prefix_grouping(args.group_prefix)
+    elif args.group_bucket is not None:
+        group_key = bucket_grouping(args.group_bucket)
+
+    try:
+        cache = ColumnCache(args.cache) if args.cache else None
+        stats = read_csv_stats(csv_path, jobs=args.jobs, quantiles=args.quantiles,
+                               compression=args.compression, cache=cache,
+                               group_by=args.group_by, group_key=group_key,
+                               max_groups=args.max_groups)
     except Exception as e:
         print('Error reading CSV:', e, file=sys.stderr)
         return 1
@@ -86,9 +779,12 @@ def main() -> int:
         print('No numeric columns found in', csv_path)
         return 0
 
-    # Print mean, min, max for each numeric column
-    for col, s in stats.items():
-        print(f"{col}: mean={s['mean']:.2f}, min={s['min']:.2f}, max={s['max']:.2f}")
+    if args.group_by:
+        for group, group_stats in stats.items():
+            print(f'{args.group_by} = {group}:')
+            print_stats(group_stats, indent='  ')
+    else:
+        print_stats(stats)
     return 0
 
 
@@ -1,12 +1,76 @@
-
 #!/usr/bin/env python3
-import re
+import mmap
+import os
+import sys
+
+# Bytes read from each end of the file at a time
+BLOCK_SIZE = 1 << 20
+
+# Byte-level cleaning for files: drop everything but ASCII letters/digits, fold case
+_FOLD = bytes.maketrans(b'ABCDEFGHIJKLMNOPQRSTUVWXYZ', b'abcdefghijklmnopqrstuvwxyz')
+_NON_ALNUM = bytes(b for b in range(256) if not (b < 128 and chr(b).isalnum()))
+
 
 def is_palindrome(s: str) -> bool:
-    cleaned = re.sub(r'[^A-Za-z0-9]', '', s).lower()
-    return cleaned == cleaned[::-1]
+    # Two pointers moving inward, skipping anything but ASCII letters/digits;
+    # stops at the first mismatch without building cleaned or reversed copies
+    i, j = 0, len(s) - 1
+    while i < j:
+        a = s[i]
+        if not (a.isascii() and a.isalnum()):
+            i += 1
+            continue
+        b = s[j]
+        if not (b.isascii() and b.isalnum()):
+            j -= 1
+            continue
+        if a.lower() != b.lower():
+            return False
+        i += 1
+        j -= 1
+    return True
+
+
+def is_palindrome_file(path: str, block_size: int = BLOCK_SIZE) -> bool:
+    """Check whether a (possibly multi-GB) text file is a palindrome.
+
+    Same rules as is_palindrome, on raw bytes: only ASCII letters and digits
+    count and case is ignored. The file is memory-mapped and read one block
+    at a time from each end; the cleaned front bytes are compared with the
+    cleaned, reversed back bytes as they arrive, so memory stays bounded by
+    the block size and a mismatch stops the scan early.
+    """
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return True
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            lo, hi = 0, size
+            front = b''  # cleaned bytes after the matched prefix
+            back = b''   # cleaned bytes before the matched suffix, reversed
+            while lo < hi:
+                if len(front) <= len(back):
+                    stop = min(lo + block_size, hi)
+                    front += mm[lo:stop].translate(_FOLD, _NON_ALNUM)
+                    lo = stop
+                else:
+                    start = max(hi - block_size, lo)
+                    back += mm[start:hi].translate(_FOLD, _NON_ALNUM)[::-1]
+                    hi = start
+                n = min(len(front), len(back))
+                if front[:n] != back[:n]:
+                    return False
+                front, back = front[n:], back[n:]
+    # Everything is read; what is left unmatched is the middle of the text
+    middle = front + back[::-1]
+    return middle == middle[::-1]
+
 
 if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        for path in sys.argv[1:]:
+            print(f"{path}: {'Palindrome' if is_palindrome_file(path) else 'Not a palindrome'}")
+        sys.exit(0)
     text = input("Enter text to check: ")
     if is_palindrome(text):
         print("Palindrome")
@@ -1,20 +1,230 @@
 import math
+import sys
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # batch_area needs NumPy; area() does not
+    np = None
+
+
+class ShapeSpec(NamedTuple):
+    arity: Optional[int]       # number of dimensions the shape takes (None: any)
+    scalar: Callable           # area from plain floats
+    vector: Callable           # area from one NumPy array per dimension
+
+
+# Dispatch table: normalised shape name -> ShapeSpec
+SHAPES: Dict[str, ShapeSpec] = {}
+
+
+def register_shape(name: str, arity: Optional[int], scalar: Callable,
+                   vector: Optional[Callable] = None) -> None:
+    """Register (or replace) a shape type for area() and batch_area().
+
+    vector defaults to scalar, which works when scalar only uses arithmetic
+    operators (they apply element-wise to NumPy arrays). With arity None the
+    shape takes any number of dimensions, and vector is called with the
+    group's whole 2-D block of dims rows (NaN-padded) instead.
+    """
+    SHAPES[name.strip().lower()] = ShapeSpec(arity, scalar, vector or scalar)
+
+
+register_shape("circle", 1, lambda r: math.pi * r * r)
+register_shape("rectangle", 2, lambda l, w: l * w)
+register_shape("square", 1, lambda s: s * s)
+register_shape("triangle", 2, lambda b, h: 0.5 * b * h)
+register_shape("trapezoid", 3, lambda a, b, h: 0.5 * (a + b) * h)
+register_shape("ellipse", 2, lambda a, b: math.pi * a * b)
+
+
+def _lookup(shape: str) -> ShapeSpec:
+    spec = SHAPES.get(shape)
+    if spec is None:
+        spec = SHAPES.get(shape.strip().lower())
+        if spec is None:
+            raise ValueError("Unsupported shape")
+    return spec
+
 
 def area(shape: str, *dims: float) -> float:
-    key = shape.strip().lower()
-    if key == "circle":
-        r, = dims; return math.pi * r * r
-    if key == "rectangle":
-        l, w = dims; return l * w
-    if key == "square":
-        s, = dims; return s * s
-    if key == "triangle":
-        b, h = dims; return 0.5 * b * h
-    if key == "trapezoid":
-        a, b, h = dims; return 0.5*(a+b)*h
-    if key == "ellipse":
-        a, b = dims; return math.pi*a*b
-    raise ValueError("Unsupported shape")
+    spec = _lookup(shape)
+    if spec.arity is not None and len(dims) != spec.arity:
+        raise ValueError(f"{shape.strip().lower()} needs {spec.arity} dimension(s), got {len(dims)}")
+    return spec.scalar(*dims)
+
+
+def _group_records(shapes) -> List[Tuple[str, "np.ndarray"]]:
+    """Split record indices by shape name: [(name, indices), ...]."""
+    if isinstance(shapes, np.ndarray) and shapes.dtype.kind == "U":
+        # String array: one vectorised comparison per registered name,
+        # np.unique only for names not spelled exactly as registered
+        groups = []
+        rest = np.ones(len(shapes), dtype=bool)
+        for name in SHAPES:
+            mask = shapes == name
+            if mask.any():
+                groups.append((name, np.flatnonzero(mask)))
+                rest &= ~mask
+        if rest.any():
+            idx = np.flatnonzero(rest)
+            kinds, inverse = np.unique(shapes[idx], return_inverse=True)
+            groups.extend((str(kind), idx[inverse.ravel() == k]) for k, kind in enumerate(kinds))
+        return groups
+
+    # Anything else: number the distinct names in one pass, then sort by code
+    codes: Dict[str, int] = {}
+    labels = np.fromiter((codes.setdefault(name, len(codes)) for name in shapes),
+                         dtype=np.intp, count=len(shapes))
+    order = np.argsort(labels, kind="stable")
+    bounds = np.concatenate(([0], np.cumsum(np.bincount(labels, minlength=len(codes)))))
+    return [(name, order[bounds[k]:bounds[k + 1]]) for name, k in codes.items()]
+
+
+def batch_area(shapes: Sequence[str], dims) -> "np.ndarray":
+    """Areas of many shapes at once, as a float64 array.
+
+    shapes holds one shape name per record; dims is a 2-D array-like with
+    one row per record and at least as many columns as the widest shape
+    (unused trailing cells are ignored, e.g. NaN padding). Records are
+    grouped by shape, and each group is computed with one
+    vectorised call of that shape's registered function.
+    """
+    if np is None:
+        raise ImportError("batch_area requires NumPy")
+    values = np.asarray(dims, dtype=np.float64)
+    if values.ndim == 1:
+        values = values[:, None]
+    if len(shapes) != len(values):
+        raise ValueError("shapes and dims must have the same length")
+    out = np.empty(len(shapes), dtype=np.float64)
+    if not len(shapes):
+        return out
+
+    for kind, idx in _group_records(shapes):
+        spec = _lookup(kind)
+        group = values[idx]
+        if spec.arity is None:
+            out[idx] = spec.vector(group)
+            continue
+        if spec.arity > values.shape[1]:
+            raise ValueError(f"{kind} needs {spec.arity} dimension(s), dims has {values.shape[1]}")
+        out[idx] = spec.vector(*(group[:, j] for j in range(spec.arity)))
+    return out
+
+
+def polygon_area(vertices) -> float:
+    """Area of a simple polygon by the shoelace formula.
+
+    vertices is an (n, 2) array-like of x, y pairs, or a flat sequence
+    x0, y0, x1, y1, ...; the polygon is closed implicitly. Coordinates are
+    taken relative to the first vertex, which keeps the cross products small
+    for projected (GIS) coordinates far from the origin.
+    """
+    # With the first vertex at the origin the closing edge adds nothing
+    if np is None:
+        pts = list(vertices)
+        if pts and not isinstance(pts[0], (tuple, list)):
+            pts = list(zip(pts[0::2], pts[1::2]))
+        if len(pts) < 3:
+            return 0.0
+        x0, y0 = pts[0]
+        xs = [x - x0 for x, _ in pts]
+        ys = [y - y0 for _, y in pts]
+        return abs(math.fsum(xs[i] * ys[i + 1] - xs[i + 1] * ys[i] for i in range(len(pts) - 1))) / 2
+    xy = np.asarray(vertices, dtype=np.float64).reshape(-1, 2)
+    if len(xy) < 3:
+        return 0.0
+    x = xy[:, 0] - xy[0, 0]
+    y = xy[:, 1] - xy[0, 1]
+    return abs(float(np.dot(x[:-1], y[1:]) - np.dot(x[1:], y[:-1]))) / 2
+
+
+def polygon_areas(flat_coords, offsets) -> "np.ndarray":
+    """Areas of a ragged collection of polygons in one vectorised pass.
+
+    flat_coords holds every vertex of every polygon back to back, as an
+    (N, 2) array or a flat x0, y0, x1, y1, ... buffer; polygon i is vertices
+    offsets[i]:offsets[i + 1], so offsets has one entry more than there are
+    polygons, starts at 0 and ends at N. No per-polygon Python objects are
+    created: each vertex is paired with its successor (wrapping to the
+    polygon's first vertex), and the cross products are summed per polygon
+    with np.add.reduceat.
+    """
+    if np is None:
+        raise ImportError("polygon_areas requires NumPy")
+    xy = np.asarray(flat_coords, dtype=np.float64).reshape(-1, 2)
+    offsets = np.asarray(offsets, dtype=np.intp)
+    n = len(xy)
+    if offsets.ndim != 1 or len(offsets) < 1 or offsets[0] != 0 or offsets[-1] != n \
+            or np.any(np.diff(offsets) < 0):
+        raise ValueError("offsets must be non-decreasing, start at 0 and end at the vertex count")
+    starts, ends = offsets[:-1], offsets[1:]
+    counts = ends - starts
+    areas = np.zeros(len(starts), dtype=np.float64)
+    if n == 0:
+        return areas
+
+    # Shift each polygon to its first vertex, then pair every vertex with the next one
+    first = np.repeat(starts, counts)
+    x = xy[:, 0] - xy[first, 0]
+    y = xy[:, 1] - xy[first, 1]
+    nxt = np.arange(1, n + 1)
+    nonempty = counts > 0
+    nxt[ends[nonempty] - 1] = starts[nonempty]
+    cross = x * y[nxt] - x[nxt] * y
+
+    areas[nonempty] = np.abs(np.add.reduceat(cross, starts[nonempty])) / 2
+    return areas
+
+
+def _polygon_scalar(*dims) -> float:
+    # area("polygon", vertices) or area("polygon", x0, y0, x1, y1, ...)
+    return polygon_area(dims[0] if len(dims) == 1 else dims)
+
+
+def _polygon_rows(block: "np.ndarray") -> "np.ndarray":
+    # batch_area rows: x0, y0, x1, y1, ... padded with trailing NaNs
+    filled = ~np.isnan(block)
+    counts = filled.sum(axis=1)
+    if np.any(counts % 2):
+        raise ValueError("polygon rows need an even number of coordinates")
+    offsets = np.concatenate(([0], np.cumsum(counts // 2)))
+    return polygon_areas(block[filled], offsets)
+
+
+register_shape("polygon", None, _polygon_scalar, _polygon_rows)
+
+
+def benchmark(n: int = 1_000_000) -> None:
+    """Compare batch_area with calling area() once per record."""
+    if np is None:
+        raise ImportError("benchmark requires NumPy")
+    rng = np.random.default_rng(0)
+    kinds = np.array([name for name, spec in SHAPES.items() if spec.arity is not None])
+    shapes = kinds[rng.integers(0, len(kinds), n)]
+    dims = rng.uniform(1.0, 10.0, size=(n, max(SHAPES[name].arity for name in kinds)))
+
+    shape_list = shapes.tolist()
+    start = time.perf_counter()
+    fast = batch_area(shapes, dims)
+    fast_time = time.perf_counter() - start
+    start = time.perf_counter()
+    from_list = batch_area(shape_list, dims)
+    list_time = time.perf_counter() - start
+    assert np.array_equal(fast, from_list)
+
+    dim_list = dims.tolist()
+    start = time.perf_counter()
+    slow = [area(shape, *row[:SHAPES[shape].arity]) for shape, row in zip(shape_list, dim_list)]
+    slow_time = time.perf_counter() - start
+
+    assert np.allclose(fast, slow)
+    print(f"{n} shapes: area() loop {slow_time:.2f} s")
+    print(f"  batch_area, NumPy string array: {fast_time:.3f} s ({slow_time / fast_time:.0f}x)")
+    print(f"  batch_area, list of names:      {list_time:.3f} s ({slow_time / list_time:.0f}x)")
+
 
 def prompt_one_shot():
     while True:
@@ -31,5 +241,37 @@ def prompt_one_shot():
             print("Error:", e); continue
         print(f"{shape.title()} area = {a:.4f}\n")
 
+def benchmark_polygons(n_polygons: int = 1_000_000, big: int = 1_000_000) -> None:
+    """Time polygon_area on one huge polygon and polygon_areas on many small ones."""
+    if np is None:
+        raise ImportError("benchmark_polygons requires NumPy")
+    rng = np.random.default_rng(0)
+    # Regular polygon with `big` vertices, far from the origin like projected coordinates
+    t = np.linspace(0.0, 2 * math.pi, big, endpoint=False)
+    ring = np.column_stack((500_000 + 100 * np.cos(t), 4_000_000 + 100 * np.sin(t)))
+    start = time.perf_counter()
+    a = polygon_area(ring)
+    print(f"polygon_area, {big} vertices: {time.perf_counter() - start:.3f} s "
+          f"(area {a:.4f}, exact {0.5 * big * 100 ** 2 * math.sin(2 * math.pi / big):.4f})")
+
+    counts = rng.integers(3, 20, n_polygons)
+    offsets = np.concatenate(([0], np.cumsum(counts)))
+    coords = rng.uniform(0.0, 1000.0, size=(int(offsets[-1]), 2))
+    start = time.perf_counter()
+    fast = polygon_areas(coords, offsets)
+    fast_time = time.perf_counter() - start
+    sample = min(n_polygons, 100_000)
+    start = time.perf_counter()
+    slow = [polygon_area(coords[offsets[i]:offsets[i + 1]]) for i in range(sample)]
+    slow_time = (time.perf_counter() - start) * n_polygons / sample
+    assert np.allclose(fast[:sample], slow)
+    print(f"{n_polygons} polygons ({offsets[-1]} vertices): polygon_areas {fast_time:.3f} s, "
+          f"per-polygon loop ~{slow_time:.1f} s ({slow_time / fast_time:.0f}x)")
+
+
 if __name__ == "__main__":
-    prompt_one_shot()
\ No newline at end of file
+    if "--benchmark" in sys.argv:
+        benchmark()
+        benchmark_polygons()
+    else:
+        prompt_one_shot()
\ No newline at end of file
@@ -5,20 +5,30 @@ This program can work with:
   - A list of numbers provided via command-line arguments
   - Interactive input (entering numbers one by one)
   - A CSV file containing numeric columns
+  - A CSV stream (--stream, or -f - for stdin), read in fixed-size chunks
+    so memory stays constant regardless of its length
 """
 
 import argparse
-import csv
 import os
 import sys
-from typing import List
+import time
+from typing import BinaryIO, Dict, List, Sequence, Tuple
 
+from csv_cache import DEFAULT_CACHE_DIR, ColumnCache
+from csv_scan import BLOCK_SIZE, iter_stream_blocks, read_header, scan_numeric_columns
 
-def sum_of_squares(numbers: List[float]) -> float:
+try:
+    import numpy as np
+except ImportError:  # fall back to pure-Python sums
+    np = None
+
+
+def sum_of_squares(numbers: Sequence[float]) -> float:
     """Calculate the sum of squares for a list of numbers.
     
     Args:
-        numbers: List of numeric values
+        numbers: List of numeric values (or an array('d') / memoryview of doubles)
         
     Returns:
         Sum of squares of all numbers
@@ -26,11 +36,73 @@ def sum_of_squares(numbers: List[float]) -> float:
     Raises:
         ValueError: If the list is empty
     """
-    if not numbers:
+    if not len(numbers):
         raise ValueError("Cannot calculate sum of squares: empty list")
+    if np is not None:
+        values = np.asarray(numbers, dtype=np.float64)
+        return float(np.dot(values, values))
     return sum(x * x for x in numbers)
 
 
+def stream_sum_of_squares(stream: BinaryIO, columns: List[str],
+                          chunk_size: int = BLOCK_SIZE) -> Tuple[Dict[str, float], Dict[str, int], int]:
+    """Sum the squares of several CSV columns of a binary stream in one pass.
+    
+    The stream is read chunk_size bytes at a time; each chunk's values are
+    turned into NumPy arrays and np.dot(chunk, chunk) is added to a running
+    total, so memory does not grow with the length of the stream.
+    
+    Returns:
+        (sum of squares per column, numeric values per column, rows read)
+        
+    Raises:
+        KeyError: If a column is not in the header
+    """
+    totals = {col: 0.0 for col in columns}
+    counts = {col: 0 for col in columns}
+    rows = 0
+    for nrows, block in iter_stream_blocks(stream, columns, chunk_size):
+        rows += nrows
+        for col, values in zip(columns, block):
+            if np is not None:
+                chunk = np.frombuffer(values, dtype=np.float64)
+                totals[col] += float(np.dot(chunk, chunk))
+            else:
+                totals[col] += sum(x * x for x in values)
+            counts[col] += len(values)
+    return totals, counts, rows
+
+
+def stream_mode(source: str, columns: List[str], chunk_size: int) -> int:
+    """Stream a CSV file (or stdin for '-') and print each column's sum of squares."""
+    start = time.perf_counter()
+    try:
+        if source == '-':
+            totals, counts, rows = stream_sum_of_squares(sys.stdin.buffer, columns, chunk_size)
+        else:
+            with open(source, 'rb') as f:
+                totals, counts, rows = stream_sum_of_squares(f, columns, chunk_size)
+    except FileNotFoundError:
+        print(f"Error: File '{source}' not found.", file=sys.stderr)
+        return 1
+    except KeyError as e:
+        print(f"Error: {e.args[0]}", file=sys.stderr)
+        return 1
+    elapsed = time.perf_counter() - start
+    
+    name = 'stdin' if source == '-' else source
+    status = 0
+    for col in columns:
+        if not counts[col]:
+            print(f"No valid numbers found in column '{col}'")
+            status = 1
+            continue
+        print(f"Sum of squares from {name} (column '{col}'): {totals[col]:.4f}")
+    rate = rows / elapsed if elapsed > 0 else float('inf')
+    print(f"Read {rows} rows in {elapsed:.2f} s ({rate:,.0f} rows/s)")
+    return status
+
+
 def interactive_mode() -> int:
     """Interactive mode: prompt user for numbers."""
     print("Sum of Squares Calculator")
@@ -72,11 +144,18 @@ def main(argv: List[str] | None = None) -> int:
     parser.add_argument('numbers', nargs='*', type=float, 
                        help='Numbers to calculate sum of squares')
     parser.add_argument('-f', '--file', metavar='CSV_FILE',
-                       help='Read numbers from a CSV file')
-    parser.add_argument('-c', '--column', metavar='COLUMN', default='Value',
-                       help='Column name to read from CSV (default: Value)')
+                       help="Read numbers from a CSV file ('-' streams from stdin)")
+    parser.add_argument('-c', '--column', metavar='COLUMN', action='append',
+                       help='Column name to read from CSV; repeat for several columns (default: Value)')
+    parser.add_argument('--stream', action='store_true',
+                       help='Read the CSV in fixed-size chunks with constant memory')
+    parser.add_argument('--chunk-size', type=int, default=BLOCK_SIZE, metavar='BYTES',
+                       help=f'Bytes read per chunk in stream mode (default: {BLOCK_SIZE})')
+    parser.add_argument('--cache', nargs='?', const=DEFAULT_CACHE_DIR, metavar='DIR',
+                       help=f'Cache parsed CSV columns on disk (default dir: {DEFAULT_CACHE_DIR})')
     
     args = parser.parse_args(argv if argv is not None else None)
+    columns = args.column or ['Value']
     
     # If numbers provided via CLI
     if args.numbers:
@@ -88,31 +167,38 @@ def main(argv: List[str] | None = None) -> int:
             print(f"Error: {e}", file=sys.stderr)
             return 1
     
+    # Stream mode: chunked reads from a file or stdin
+    if args.stream or args.file == '-':
+        return stream_mode(args.file or '-', columns, args.chunk_size)
+    
     # If CSV file provided
     if args.file:
         try:
-            numbers = []
-            with open(args.file, 'r', newline='', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                if args.column not in reader.fieldnames:
-                    print(f"Error: Column '{args.column}' not found in CSV.")
-                    print(f"Available columns: {', '.join(reader.fieldnames)}")
+            header, _ = read_header(args.file)
+            for col in columns:
+                if col not in header:
+                    print(f"Error: Column '{col}' not found in CSV.")
+                    print(f"Available columns: {', '.join(header)}")
                     return 1
-                
-                for row in reader:
-                    try:
-                        val = float(row[args.column])
-                        numbers.append(val)
-                    except (ValueError, KeyError):
-                        continue
             
-            if not numbers:
-                print(f"No valid numbers found in column '{args.column}'")
-                return 1
+            if args.cache:
+                # Parsed once, then memory-mapped from the cache on later runs
+                cache = ColumnCache(args.cache)
+                values = cache.get_named_columns(args.file, columns)
+            else:
+                # Memory-mapped scan straight into an array('d') per column
+                values = scan_numeric_columns(args.file, columns)
             
-            result = sum_of_squares(numbers)
-            print(f"Sum of squares from {args.file} (column '{args.column}'): {result:.4f}")
-            return 0
+            status = 0
+            for col in columns:
+                numbers = values[col]
+                if not numbers:
+                    print(f"No valid numbers found in column '{col}'")
+                    status = 1
+                    continue
+                result = sum_of_squares(numbers)
+                print(f"Sum of squares from {args.file} (column '{col}'): {result:.4f}")
+            return status
             
         except FileNotFoundError:
             print(f"Error: File '{args.file}' not found.", file=sys.stderr)
@@ -1,35 +1,107 @@
 # TGNPDCL Electricity Bill Calculator
 
-def calculate_energy_charges(units, customer_type):
-    # Energy charges based on customer type and consumption slabs
-    domestic_slabs = [
+import argparse
+import csv
+import hashlib
+import os
+import random
+import shutil
+import sqlite3
+import string
+import tempfile
+import time
+from collections import deque
+from itertools import repeat
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import numpy as np
+except ImportError:  # only the batch engine needs NumPy
+    np = None
+
+# Energy slabs per customer type: (first unit, last unit, Rs. per unit)
+ENERGY_SLABS = {
+    'domestic': (
         (0, 50, 1.95),
         (51, 100, 3.00),
         (101, 200, 4.50),
         (201, float('inf'), 7.50)
-    ]
-    
-    commercial_slabs = [
+    ),
+    'commercial': (
         (0, 100, 6.50),
         (101, 200, 7.50),
         (201, float('inf'), 8.50)
-    ]
-    
-    industrial_slabs = [
+    ),
+    'industrial': (
         (0, 200, 7.00),
         (201, 400, 8.00),
         (401, float('inf'), 9.00)
-    ]
-    
+    ),
+}
+
+# Fixed charges in Rs. per kW of connected load
+FIXED_CHARGE_PER_KW = {'domestic': 35, 'commercial': 65, 'industrial': 95}
+
+# Monthly customer charges; unknown categories pay the default
+CUSTOMER_CHARGES = {'domestic': 30, 'commercial': 50, 'industrial': 100}
+DEFAULT_CUSTOMER_CHARGE = 30
+
+# Electricity duty as a fraction of energy charges
+ELECTRICITY_DUTY_RATE = 0.06
+
+# Batch engine: customer type codes (anything else is OTHER_TYPE, billed
+# like industrial except for the default customer charge)
+CUSTOMER_TYPES = ('domestic', 'commercial', 'industrial')
+OTHER_TYPE = len(CUSTOMER_TYPES)
+
+# Columns bill_batch needs in the readings CSV
+READING_COLUMNS = ('customer_id', 'customer_type', 'previous_reading',
+                   'current_reading', 'connected_load')
+
+# Readings parsed and billed at a time by bill_batch
+BATCH_CHUNK_ROWS = 1 << 20
+
+# Readings per chunk handed to a worker by render_bills
+RENDER_CHUNK_ROWS = 50_000
+
+# Billing state kept per customer: the inputs of the last bill and its charges
+STATE_INPUTS = ('customer_type', 'previous_reading', 'current_reading', 'connected_load')
+BILL_OUTPUTS = ('units', 'energy_charges', 'fixed_charges', 'customer_charges',
+                'electricity_duty', 'total')
+
+# Tariff simulation: consumption is binned per whole unit up to this many
+# units; larger consumptions are kept individually
+HISTOGRAM_MAX_BINS = 1 << 20
+
+# Printed bill, exactly as print_bill lays it out
+BILL_TEMPLATE = (
+    "\n" + "=" * 50 + "\n"
+    "           TGNPDCL ELECTRICITY BILL\n"
+    + "=" * 50 + "\n"
+    "\nCustomer Name: {customer_name}\n"
+    "Customer Type: {customer_type}\n"
+    "Connected Load: {connected_load} kW\n"
+    "Previous Reading: {previous_reading}\n"
+    "Current Reading: {current_reading}\n"
+    "Units Consumed: {units}\n"
+    "\nBill Details:\n"
+    + "-" * 50 + "\n"
+    "Energy Charges: Rs. {energy_charges:.2f}\n"
+    "Fixed Charges: Rs. {fixed_charges:.2f}\n"
+    "Customer Charges: Rs. {customer_charges:.2f}\n"
+    "Electricity Duty: Rs. {electricity_duty:.2f}\n"
+    + "-" * 50 + "\n"
+    "Total Amount: Rs. {total:.2f}\n"
+    + "=" * 50 + "\n"
+)
+
+
+def calculate_energy_charges(units, customer_type):
+    # Energy charges based on customer type and consumption slabs
     total_charge = 0
     remaining_units = units
     
-    if customer_type.lower() == 'domestic':
-        slabs = domestic_slabs
-    elif customer_type.lower() == 'commercial':
-        slabs = commercial_slabs
-    else:  # industrial
-        slabs = industrial_slabs
+    slabs = ENERGY_SLABS.get(customer_type.lower(), ENERGY_SLABS['industrial'])
     
     for lower, upper, rate in slabs:
         if remaining_units <= 0:
@@ -45,61 +117,784 @@ def calculate_energy_charges(units, customer_type):
     return total_charge
 
 def calculate_fixed_charges(customer_type, connected_load):
-    # Fixed charges based on customer type and connected load
-    if customer_type.lower() == 'domestic':
-        return connected_load * 35  # Rs. 35 per kW
-    elif customer_type.lower() == 'commercial':
-        return connected_load * 65  # Rs. 65 per kW
-    else:  # industrial
-        return connected_load * 95  # Rs. 95 per kW
+    # Fixed charges based on customer type and connected load (industrial rate otherwise)
+    rate = FIXED_CHARGE_PER_KW.get(customer_type.lower(), FIXED_CHARGE_PER_KW['industrial'])
+    return connected_load * rate
 
 def calculate_customer_charges(customer_type):
     # Customer charges based on category
-    charges = {
-        'domestic': 30,
-        'commercial': 50,
-        'industrial': 100
-    }
-    return charges.get(customer_type.lower(), 30)
+    return CUSTOMER_CHARGES.get(customer_type.lower(), DEFAULT_CUSTOMER_CHARGE)
 
 def calculate_electricity_duty(energy_charges):
     # Electricity duty is typically 6% of energy charges
-    return energy_charges * 0.06
+    return energy_charges * ELECTRICITY_DUTY_RATE
 
-def print_bill(customer_name, customer_type, previous_reading, current_reading, connected_load):
-    print("\n" + "="*50)
-    print("           TGNPDCL ELECTRICITY BILL")
-    print("="*50)
-    
-    print(f"\nCustomer Name: {customer_name}")
-    print(f"Customer Type: {customer_type.title()}")
-    print(f"Connected Load: {connected_load} kW")
-    print(f"Previous Reading: {previous_reading}")
-    print(f"Current Reading: {current_reading}")
-    
-    # Calculate units consumed
+def _cumulative_table(slabs):
+    """Return (slab start in cumulative units, rate, charge for all units before the slab, width).
+
+    Same slab semantics as calculate_energy_charges: a slab (lower, upper)
+    covers upper - lower + 1 units.
+    """
+    starts, rates, base, widths = [], [], [], []
+    start = charge = 0.0
+    for lower, upper, rate in slabs:
+        starts.append(start)
+        rates.append(rate)
+        base.append(charge)
+        width = upper - lower + 1
+        widths.append(width)
+        start += width
+        charge += width * rate
+    return np.array(starts), np.array(rates), np.array(base), np.array(widths)
+
+def _type_tables():
+    """Per type code: cumulative energy table, fixed rate per kW and customer charge."""
+    names = CUSTOMER_TYPES + ('industrial',)  # OTHER_TYPE uses industrial slabs/fixed rate
+    energy = [_cumulative_table(ENERGY_SLABS[name]) for name in names]
+    fixed = np.array([FIXED_CHARGE_PER_KW[name] for name in names], dtype=np.float64)
+    customer = np.array([CUSTOMER_CHARGES[name] for name in CUSTOMER_TYPES]
+                        + [DEFAULT_CUSTOMER_CHARGE], dtype=np.float64)
+    return energy, fixed, customer
+
+def tariff_fingerprint():
+    """SHA-256 over every tariff table; changes whenever any rate or slab changes."""
+    tables = (sorted(ENERGY_SLABS.items()), sorted(FIXED_CHARGE_PER_KW.items()),
+              sorted(CUSTOMER_CHARGES.items()), DEFAULT_CUSTOMER_CHARGE, ELECTRICITY_DUTY_RATE)
+    return hashlib.sha256(repr(tables).encode('utf-8')).hexdigest()
+
+# tariff_fingerprint() -> _type_tables() for the tariff currently in effect
+_TYPE_TABLES = {}
+
+def _current_type_tables():
+    """_type_tables() for the live tariff constants, rebuilt whenever any of them change."""
+    key = tariff_fingerprint()
+    tables = _TYPE_TABLES.get(key)
+    if tables is None:
+        _TYPE_TABLES.clear()
+        tables = _TYPE_TABLES[key] = _type_tables()
+    return tables
+
+class _TypeCodes(dict):
+    """Raw customer type string -> type code, filled on first sight of each spelling."""
+    def __missing__(self, name):
+        key = name.lower()
+        code = CUSTOMER_TYPES.index(key) if key in CUSTOMER_TYPES else OTHER_TYPE
+        self[name] = code
+        return code
+
+def bill_arrays(type_codes, previous_reading, current_reading, connected_load):
+    """Compute every charge for arrays of readings at once.
+
+    type_codes holds indices into CUSTOMER_TYPES (OTHER_TYPE for anything
+    else). Energy charges are evaluated per customer type from cumulative
+    slab tables: np.searchsorted finds each consumer's slab, and the charge
+    is the cumulative charge at the slab start plus the remaining units at
+    the slab rate. Everything else is a plain vector expression. Returns a
+    dict of float64 arrays with the same values print_bill computes, down to
+    the last bit (the operations are done in the same order).
+    """
+    if np is None:
+        raise ImportError("bill_arrays requires NumPy")
+    codes = np.asarray(type_codes, dtype=np.intp)
+    units = np.asarray(current_reading, dtype=np.float64) - np.asarray(previous_reading, dtype=np.float64)
+    load = np.asarray(connected_load, dtype=np.float64)
+    energy_tables, fixed_rates, customer_charges = _current_type_tables()
+
+    # Non-positive consumption is charged nothing, as in calculate_energy_charges
+    billable = np.maximum(units, 0.0)
+    energy = np.empty_like(units)
+    for code, (starts, rates, base, widths) in enumerate(energy_tables):
+        idx = np.flatnonzero(codes == code)
+        if not len(idx):
+            continue
+        u = billable[idx]
+        slab = np.searchsorted(starts, u, side='right') - 1
+        # Units left in the slab, subtracting the widths one by one like the loop does
+        remaining = u
+        for j, width in enumerate(widths[:-1]):
+            remaining = np.where(slab > j, remaining - width, remaining)
+        energy[idx] = base[slab] + remaining * rates[slab]
+
+    fixed = load * fixed_rates[codes]
+    customer = customer_charges[codes]
+    duty = energy * ELECTRICITY_DUTY_RATE
+    return {
+        'units': units,
+        'energy_charges': energy,
+        'fixed_charges': fixed,
+        'customer_charges': customer,
+        'electricity_duty': duty,
+        'total': energy + fixed + customer + duty,
+    }
+
+def _parse_reading_lines(lines, header):
+    """Turn CSV text lines into column lists {name: cells} for the reading columns."""
+    ncols = len(header)
+    chunk = ''.join(lines)
+    nrows = len(lines)
+    if '"' not in chunk and '\r' not in chunk and chunk.count('\n') >= nrows - 1 \
+            and set(map(str.count, lines, repeat(','))) == {ncols - 1}:
+        # Plain rows with exactly ncols fields: split the chunk in one go
+        flat = chunk.rstrip('\n').replace('\n', ',').split(',')
+        return {name: flat[i::ncols] for i, name in enumerate(header)}
+    rows = [row for row in csv.reader(lines) if row]
+    for row in rows:
+        if len(row) < ncols:
+            raise ValueError(f"Readings CSV row {','.join(row)!r} has {len(row)} field(s), "
+                             f"expected {ncols}")
+    return {name: [row[i] for row in rows] for i, name in enumerate(header)}
+
+def _quote_open(text, quoted=False):
+    """Whether a quoted field is still open at the end of text.
+
+    text must start at a record start, or inside a quoted field when
+    quoted is True. As in the csv module, only a quote at the start of a
+    field opens a quoted field and "" inside one is an escaped quote.
+    """
+    pos = 0
+    while True:
+        if quoted:
+            close = text.find('"', pos)
+            if close == -1:
+                return True
+            if text[close + 1:close + 2] == '"':
+                pos = close + 2
+                continue
+            quoted = False
+            pos = close + 1
+        else:
+            quote = text.find('"', pos)
+            if quote == -1:
+                return False
+            quoted = quote == 0 or text[quote - 1] in ',\r\n'
+            pos = quote + 1
+
+def _read_records(f, size_hint):
+    """f.readlines(size_hint), extended so that the last line ends a record.
+
+    A quoted field (such as a customer_name) may contain newlines, so a
+    record can span several lines; a chunk never splits one.
+    """
+    lines = f.readlines(size_hint)
+    if any('"' in line for line in lines):
+        quoted = _quote_open(''.join(lines))
+        while quoted:
+            line = f.readline()
+            if not line:
+                break
+            lines.append(line)
+            quoted = _quote_open(line, True)
+    return lines
+
+def _read_header(f):
+    """Read and check the readings CSV header; returns the lowercased column names."""
+    header = next(csv.reader([f.readline()]), [])
+    header = [name.strip().lower() for name in header]
+    missing = [name for name in READING_COLUMNS if name not in header]
+    if missing:
+        raise ValueError(f"Readings CSV is missing column(s): {', '.join(missing)}")
+    return header
+
+def _readings_chunk(lines, header, codes):
+    """Parse CSV lines into a readings chunk (see iter_readings)."""
+    columns = _parse_reading_lines(lines, header)
+    n = len(columns['customer_id'])
+    chunk = dict(columns)
+    chunk['type_code'] = np.fromiter(map(codes.__getitem__, columns['customer_type']),
+                                     dtype=np.int8, count=n)
+    for name in READING_COLUMNS[2:]:
+        chunk[name] = np.fromiter(map(float, columns[name]), dtype=np.float64, count=n)
+    return chunk
+
+def iter_readings(readings_csv, chunk_rows=BATCH_CHUNK_ROWS):
+    """Yield the readings CSV in chunks of NumPy arrays.
+
+    The CSV needs a header with the READING_COLUMNS (other columns, such as
+    customer_name, are passed through as lists of strings). Each chunk is a
+    dict with 'customer_id' and 'customer_type' lists, 'type_code' (int8)
+    and float64 'previous_reading', 'current_reading' and 'connected_load'.
+    At most about chunk_rows rows are held at a time.
+    """
+    if np is None:
+        raise ImportError("iter_readings requires NumPy")
+    codes = _TypeCodes()
+    with open(readings_csv, 'r', newline='', encoding='utf-8') as f:
+        header = _read_header(f)
+        while True:
+            lines = _read_records(f, chunk_rows * 32)
+            if not lines:
+                break
+            yield _readings_chunk(lines, header, codes)
+
+def bill_batch(readings_csv, chunk_rows=BATCH_CHUNK_ROWS, store=None):
+    """Bill every customer in a readings CSV (see iter_readings for the format).
+
+    Returns a dict of columns: the readings plus 'units', 'energy_charges',
+    'fixed_charges', 'customer_charges', 'electricity_duty' and 'total', as
+    computed by bill_arrays chunk by chunk. With a BillingStateStore every
+    chunk is also checkpointed there for incremental_bill.
+    """
+    tariff = tariff_fingerprint() if store is not None else None
+    parts = []
+    for chunk in iter_readings(readings_csv, chunk_rows):
+        chunk.update(bill_arrays(chunk['type_code'], chunk['previous_reading'],
+                                 chunk['current_reading'], chunk['connected_load']))
+        if store is not None:
+            store.save(chunk, tariff)
+        parts.append(chunk)
+    if not parts:
+        return {}
+    result = {}
+    for name, first in parts[0].items():
+        if isinstance(first, list):
+            result[name] = first
+            for part in parts[1:]:
+                first.extend(part[name])
+        else:
+            result[name] = np.concatenate([part[name] for part in parts])
+    return result
+
+class BillTemplate:
+    """A bill layout parsed once and then filled many times.
+
+    The {field:spec} placeholders are split out of the template up front
+    and the literal text is turned into a %-format string, so rendering is
+    one % operation per bill, and render_many formats each field for a
+    whole chunk of bills column by column.
+    """
+
+    def __init__(self, template):
+        literals, self.fields = [], []
+        for literal, field, spec, conversion in string.Formatter().parse(template):
+            literals.append(literal.replace('%', '%%'))
+            if field is not None:
+                if conversion:
+                    raise ValueError("conversions are not supported in bill templates")
+                self.fields.append((field, spec))
+        self.pattern = '%s'.join(literals)
+
+    def render(self, values):
+        """Render one bill from a mapping of field -> value."""
+        return self.pattern % tuple(format(values[name], spec) for name, spec in self.fields)
+
+    def render_many(self, columns):
+        """Render a chunk of bills from field -> sequence of values; returns one string."""
+        formatted = []
+        for name, spec in self.fields:
+            values = columns[name]
+            if hasattr(values, 'tolist'):
+                values = values.tolist()
+            formatted.append(values if not spec and values and isinstance(values[0], str)
+                             else [format(v, spec) for v in values])
+        return ''.join(map(self.pattern.__mod__, zip(*formatted)))
+
+_BILL = BillTemplate(BILL_TEMPLATE)
+
+def render_bill(customer_name, customer_type, previous_reading, current_reading, connected_load):
+    """Return (bill text, total amount) for one customer, as print_bill prints it."""
     units = current_reading - previous_reading
-    print(f"Units Consumed: {units}")
-    
-    # Calculate different charges
     energy_charges = calculate_energy_charges(units, customer_type)
     fixed_charges = calculate_fixed_charges(customer_type, connected_load)
     customer_charges = calculate_customer_charges(customer_type)
     electricity_duty = calculate_electricity_duty(energy_charges)
-    
-    # Calculate total bill
     total_bill = energy_charges + fixed_charges + customer_charges + electricity_duty
-    
-    print("\nBill Details:")
-    print("-"*50)
-    print(f"Energy Charges: Rs. {energy_charges:.2f}")
-    print(f"Fixed Charges: Rs. {fixed_charges:.2f}")
-    print(f"Customer Charges: Rs. {customer_charges:.2f}")
-    print(f"Electricity Duty: Rs. {electricity_duty:.2f}")
-    print("-"*50)
-    print(f"Total Amount: Rs. {total_bill:.2f}")
-    print("="*50)
-    
+    text = _BILL.render({
+        'customer_name': customer_name,
+        'customer_type': customer_type.title(),
+        'connected_load': connected_load,
+        'previous_reading': previous_reading,
+        'current_reading': current_reading,
+        'units': units,
+        'energy_charges': energy_charges,
+        'fixed_charges': fixed_charges,
+        'customer_charges': customer_charges,
+        'electricity_duty': electricity_duty,
+        'total': total_bill,
+    })
+    return text, total_bill
+
+def _render_chunk(lines, header, shard_path):
+    """Worker: parse, bill and render one chunk of CSV lines into a shard file.
+
+    Returns (bills, total amount, {stage: seconds}).
+    """
+    timings = {}
+    start = time.perf_counter()
+    chunk = _readings_chunk(lines, header, _TypeCodes())
+    timings['parse'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    chunk.update(bill_arrays(chunk['type_code'], chunk['previous_reading'],
+                             chunk['current_reading'], chunk['connected_load']))
+    timings['bill'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    titles = {name: name.title() for name in set(chunk['customer_type'])}
+    chunk['customer_type'] = [titles[name] for name in chunk['customer_type']]
+    if 'customer_name' not in chunk:
+        chunk['customer_name'] = chunk['customer_id']
+    text = _BILL.render_many(chunk) if len(chunk['total']) else ''
+    timings['render'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    with open(shard_path, 'w', encoding='utf-8', newline='', buffering=1 << 20) as out:
+        out.write(text)
+    timings['write'] = time.perf_counter() - start
+    return len(chunk['total']), float(chunk['total'].sum()), timings
+
+def render_bills(readings_csv, out_path, jobs=1, chunk_rows=RENDER_CHUNK_ROWS, report=True):
+    """Write a printed bill for every customer in a readings CSV to out_path.
+
+    The CSV is streamed chunk_rows lines at a time. Each chunk is parsed,
+    billed with bill_arrays and rendered from BILL_TEMPLATE by a worker
+    process (jobs of them), which writes it to its own shard file; at most
+    2 * jobs chunks are in flight, so memory stays bounded however many
+    customers there are. The shards are concatenated into out_path in input
+    order, so the output equals calling print_bill for every row. A bill
+    with no customer_name column uses the customer_id.
+
+    Returns (number of bills, total amount, {stage: seconds}); the parse,
+    bill, render and write stages are summed over workers.
+    """
+    if np is None:
+        raise ImportError("render_bills requires NumPy")
+    if jobs < 1:
+        raise ValueError('jobs must be at least 1')
+    timings = dict.fromkeys(('read', 'parse', 'bill', 'render', 'write', 'concat'), 0.0)
+    count, amount = 0, 0.0
+    shard_dir = tempfile.mkdtemp(prefix='bills_', dir=os.path.dirname(os.path.abspath(out_path)))
+    shards = []
+    started = time.perf_counter()
+
+    def collect(result):
+        nonlocal count, amount
+        bills, total, stage_times = result
+        count += bills
+        amount += total
+        for stage, seconds in stage_times.items():
+            timings[stage] += seconds
+
+    try:
+        pool = ProcessPoolExecutor(max_workers=jobs) if jobs > 1 else None
+        try:
+            pending = deque()
+            with open(readings_csv, 'r', newline='', encoding='utf-8') as f:
+                header = _read_header(f)
+                while True:
+                    start = time.perf_counter()
+                    lines = _read_records(f, chunk_rows * 32)
+                    timings['read'] += time.perf_counter() - start
+                    if not lines:
+                        break
+                    shard = os.path.join(shard_dir, f'{len(shards):06d}.txt')
+                    shards.append(shard)
+                    if pool is None:
+                        collect(_render_chunk(lines, header, shard))
+                        continue
+                    pending.append(pool.submit(_render_chunk, lines, header, shard))
+                    if len(pending) >= 2 * jobs:
+                        collect(pending.popleft().result())
+            while pending:
+                collect(pending.popleft().result())
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+        start = time.perf_counter()
+        with open(out_path, 'wb') as out:
+            for shard in shards:
+                with open(shard, 'rb') as f:
+                    shutil.copyfileobj(f, out, 1 << 20)
+                os.remove(shard)
+        timings['concat'] = time.perf_counter() - start
+    finally:
+        shutil.rmtree(shard_dir, ignore_errors=True)
+
+    elapsed = time.perf_counter() - started
+    if report:
+        rate = count / elapsed if elapsed > 0 else float('inf')
+        print(f"Rendered {count} bills to {out_path} in {elapsed:.2f} s "
+              f"({rate:,.0f} bills/s, {jobs} worker(s))")
+        for stage, seconds in timings.items():
+            print(f"  {stage:<7} {seconds:8.2f} s")
+    return count, amount, timings
+
+class BillingStateStore:
+    """SQLite checkpoint of the last bill of every customer.
+
+    One row per customer_id holds the bill's inputs (STATE_INPUTS), the
+    tariff fingerprint it was computed under and its charges (BILL_OUTPUTS).
+    Floats are stored as 8-byte REALs, so they round-trip exactly.
+    """
+
+    # Rows read or re-billed per query
+    BATCH_ROWS = 50_000
+
+    def __init__(self, path):
+        self.conn = sqlite3.connect(path)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        columns = ', '.join(f'{name} REAL NOT NULL' for name in STATE_INPUTS[1:] + BILL_OUTPUTS)
+        self.conn.execute(f'CREATE TABLE IF NOT EXISTS bills (customer_id TEXT PRIMARY KEY, '
+                          f'customer_type TEXT NOT NULL, tariff TEXT NOT NULL, {columns})')
+        self.conn.execute('CREATE INDEX IF NOT EXISTS bills_tariff ON bills (tariff)')
+        self.conn.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.conn.execute('SELECT COUNT(*) FROM bills').fetchone()[0]
+
+    def close(self):
+        self.conn.close()
+
+    def save(self, bills, tariff):
+        """Insert or replace the rows of a billed chunk (columns as returned by bill_arrays)."""
+        names = ('customer_id', 'tariff') + STATE_INPUTS + BILL_OUTPUTS
+        columns = [bills['customer_id'], [tariff] * len(bills['customer_id'])]
+        for name in STATE_INPUTS + BILL_OUTPUTS:
+            values = bills[name]
+            columns.append(values.tolist() if hasattr(values, 'tolist') else values)
+        with self.conn:
+            self.conn.executemany(
+                f"INSERT OR REPLACE INTO bills ({', '.join(names)}) VALUES ({', '.join('?' * len(names))})",
+                zip(*columns))
+
+    def load(self, customer_ids):
+        """Return {customer_id: row} for the stored customers among customer_ids.
+
+        A row is (tariff, *STATE_INPUTS, *BILL_OUTPUTS).
+        """
+        names = ('customer_id', 'tariff') + STATE_INPUTS + BILL_OUTPUTS
+        rows = {}
+        ids = list(dict.fromkeys(customer_ids))
+        for start in range(0, len(ids), 500):
+            batch = ids[start:start + 500]
+            query = (f"SELECT {', '.join(names)} FROM bills "
+                     f"WHERE customer_id IN ({', '.join('?' * len(batch))})")
+            for row in self.conn.execute(query, batch):
+                rows[row[0]] = row[1:]
+        return rows
+
+    def stale(self, tariff, limit):
+        """Return up to `limit` stored readings billed under a different tariff, as records."""
+        names = ('customer_id',) + STATE_INPUTS
+        query = f"SELECT {', '.join(names)} FROM bills WHERE tariff != ? LIMIT ?"
+        return [dict(zip(names, row)) for row in self.conn.execute(query, (tariff, limit))]
+
+def _records_chunk(records):
+    """Build a readings chunk (as from iter_readings) from a list of dicts."""
+    codes = _TypeCodes()
+    n = len(records)
+    chunk = {
+        'customer_id': [str(r['customer_id']) for r in records],
+        'customer_type': [str(r['customer_type']) for r in records],
+    }
+    chunk['type_code'] = np.fromiter(map(codes.__getitem__, chunk['customer_type']),
+                                     dtype=np.int8, count=n)
+    for name in READING_COLUMNS[2:]:
+        chunk[name] = np.fromiter((float(r[name]) for r in records), dtype=np.float64, count=n)
+    return chunk
+
+def _take(chunk, idx):
+    """Select rows idx (a list of positions) from every column of a chunk."""
+    return {name: [values[i] for i in idx] if isinstance(values, list) else values[idx]
+            for name, values in chunk.items()}
+
+def incremental_bill(changes, store, chunk_rows=BATCH_CHUNK_ROWS):
+    """Re-bill only what changed since the bills checkpointed in store.
+
+    changes is a readings CSV path (see iter_readings) or a list of dicts
+    with the READING_COLUMNS. A customer in changes is recomputed only when
+    its type, readings or load differ from its stored bill, or the bill was
+    made under another tariff (see tariff_fingerprint); otherwise the stored
+    charges are reused. Customers in the store billed under an old tariff
+    are re-billed from their stored readings as well. The charges come from
+    bill_arrays, so they equal a full bill_batch run bit for bit.
+
+    Returns ({customer_id: {charge: value}} for every customer in changes
+    or re-billed, number of bills skipped).
+    """
+    if np is None:
+        raise ImportError("incremental_bill requires NumPy")
+    tariff = tariff_fingerprint()
+    chunks = (iter_readings(changes, chunk_rows) if isinstance(changes, (str, os.PathLike))
+              else [_records_chunk(list(changes))])
+    bills = {}
+    skipped = 0
+
+    def rebill(chunk):
+        chunk.update(bill_arrays(chunk['type_code'], chunk['previous_reading'],
+                                 chunk['current_reading'], chunk['connected_load']))
+        store.save(chunk, tariff)
+        outputs = [chunk[name].tolist() for name in BILL_OUTPUTS]
+        for cid, values in zip(chunk['customer_id'], zip(*outputs)):
+            bills[cid] = dict(zip(BILL_OUTPUTS, values))
+
+    for chunk in chunks:
+        ids = chunk['customer_id']
+        stored = store.load(ids)
+        inputs = zip(chunk['customer_type'], chunk['previous_reading'].tolist(),
+                     chunk['current_reading'].tolist(), chunk['connected_load'].tolist())
+        changed = []
+        for i, (cid, current) in enumerate(zip(ids, inputs)):
+            row = stored.get(cid)
+            if row is not None and row[0] == tariff and tuple(row[1:5]) == current:
+                bills[cid] = dict(zip(BILL_OUTPUTS, row[5:]))
+                skipped += 1
+            else:
+                changed.append(i)
+        if changed:
+            rebill(_take(chunk, changed))
+
+    # Tariff changed since these were billed: re-bill from the stored readings
+    while True:
+        records = store.stale(tariff, store.BATCH_ROWS)
+        if not records:
+            break
+        rebill(_records_chunk(records))
+    return bills, skipped
+
+class ConsumptionHistogram:
+    """Billable units of a group of customers, binned by whole unit, with prefix sums.
+
+    count_prefix[b] / sum_prefix[b] are the number and total units of the
+    customers consuming less than b units. Consumptions of max_bins units or
+    more are kept in a sorted array with their own prefix sums, so the
+    histogram stays small whatever the outliers are.
+    """
+
+    def __init__(self, max_bins=HISTOGRAM_MAX_BINS):
+        self.max_bins = max_bins
+        self.counts = np.zeros(0, dtype=np.int64)
+        self.sums = np.zeros(0, dtype=np.float64)
+        self._tail = []
+        self.count_prefix = self.sum_prefix = self.tail = self.tail_prefix = None
+
+    def add(self, units):
+        """Add a block of consumptions (non-positive ones count as 0 units)."""
+        u = np.maximum(np.asarray(units, dtype=np.float64), 0.0)
+        inside = u < self.max_bins
+        self._tail.append(u[~inside])
+        u = u[inside]
+        if not len(u):
+            return
+        bins = u.astype(np.intp)
+        size = int(bins.max()) + 1
+        if size > len(self.counts):
+            self.counts = np.concatenate((self.counts, np.zeros(size - len(self.counts), dtype=np.int64)))
+            self.sums = np.concatenate((self.sums, np.zeros(size - len(self.sums))))
+        self.counts[:size] += np.bincount(bins, minlength=size)
+        self.sums[:size] += np.bincount(bins, weights=u, minlength=size)
+
+    def finish(self):
+        """Build the prefix sums; call once after the last add()."""
+        self.count_prefix = np.concatenate(([0], np.cumsum(self.counts)))
+        self.sum_prefix = np.concatenate(([0.0], np.cumsum(self.sums)))
+        self.tail = np.sort(np.concatenate(self._tail)) if self._tail else np.zeros(0)
+        self.tail_prefix = np.concatenate(([0.0], np.cumsum(self.tail)))
+        self._tail = []
+        return self
+
+    @property
+    def customers(self):
+        return int(self.count_prefix[-1]) + len(self.tail)
+
+    @property
+    def total_units(self):
+        return float(self.sum_prefix[-1] + self.tail_prefix[-1])
+
+    def units_up_to(self, limits):
+        """Sum over customers of min(units, limit), for each limit in an array.
+
+        Customers with units < limit are found through the bin prefix sums at
+        ceil(limit): exact when the limits or the consumptions are whole units.
+        """
+        limits = np.asarray(limits, dtype=np.float64)
+        finite = np.isfinite(limits)
+        safe = np.where(finite, limits, 0.0)
+        idx = np.minimum(np.ceil(safe).astype(np.intp), len(self.count_prefix) - 1)
+        below = self.sum_prefix[idx] + safe * (self.count_prefix[-1] - self.count_prefix[idx])
+        t = np.searchsorted(self.tail, safe, side='left')
+        below += self.tail_prefix[t] + safe * (len(self.tail) - t)
+        return np.where(finite, below, self.total_units)
+
+def consumption_histograms(readings, max_bins=HISTOGRAM_MAX_BINS):
+    """Bin billable consumption once per customer type.
+
+    readings is a readings CSV path or a dict of columns with 'type_code'
+    and either 'units' or 'previous_reading'/'current_reading' (such as the
+    result of bill_batch). Returns {type name: ConsumptionHistogram} for
+    CUSTOMER_TYPES plus 'other'.
+    """
+    if np is None:
+        raise ImportError("consumption_histograms requires NumPy")
+    names = CUSTOMER_TYPES + ('other',)
+    histograms = {name: ConsumptionHistogram(max_bins) for name in names}
+    chunks = (iter_readings(readings) if isinstance(readings, (str, os.PathLike)) else [readings])
+    for chunk in chunks:
+        if 'units' in chunk:
+            units = np.asarray(chunk['units'], dtype=np.float64)
+        else:
+            units = np.asarray(chunk['current_reading'], dtype=np.float64) - chunk['previous_reading']
+        codes = np.asarray(chunk['type_code'])
+        for code, name in enumerate(names):
+            histograms[name].add(units[codes == code])
+    return {name: histogram.finish() for name, histogram in histograms.items()}
+
+def current_tariff():
+    """The tariff in force, in the scenario format used by simulate_tariffs."""
+    return {'energy_slabs': dict(ENERGY_SLABS), 'duty_rate': ELECTRICITY_DUTY_RATE}
+
+def simulate_tariffs(readings, scenarios):
+    """Estimate energy revenue and duty under alternative slab tables.
+
+    readings is anything consumption_histograms accepts, or its result
+    (reuse it to evaluate more scenarios without re-reading the data).
+    scenarios maps a name to {'energy_slabs': {type: slabs}, 'duty_rate':
+    rate}; slabs are (lower, upper, rate) tuples like ENERGY_SLABS, types
+    missing from a scenario keep their current slabs, 'other' customers use
+    the industrial slabs as in billing, and duty_rate defaults to
+    ELECTRICITY_DUTY_RATE.
+
+    Every slab's units come from two prefix-sum lookups, so once the data is
+    binned a scenario costs O(slabs), independent of the number of
+    customers. Results are exact when slab boundaries or consumptions are
+    whole units. Returns {name: {'energy_charges', 'electricity_duty',
+    'by_type': {type: {'customers', 'units', 'energy_charges', 'slabs':
+    [{'lower', 'upper', 'rate', 'units', 'energy_charges'}, ...]}}}}.
+    """
+    if np is None:
+        raise ImportError("simulate_tariffs requires NumPy")
+    histograms = readings if isinstance(readings, dict) and readings and all(
+        isinstance(h, ConsumptionHistogram) for h in readings.values()) else consumption_histograms(readings)
+
+    results = {}
+    for name, scenario in scenarios.items():
+        slab_tables = dict(ENERGY_SLABS)
+        slab_tables.update(scenario.get('energy_slabs', {}))
+        duty_rate = scenario.get('duty_rate', ELECTRICITY_DUTY_RATE)
+        by_type = {}
+        energy_total = 0.0
+        for type_name, histogram in histograms.items():
+            slabs = slab_tables[type_name if type_name in CUSTOMER_TYPES else 'industrial']
+            starts, rates, _, widths = _cumulative_table(slabs)
+            below = histogram.units_up_to(np.concatenate((starts, starts + widths)))
+            slab_units = below[len(starts):] - below[:len(starts)]
+            revenue = slab_units * rates
+            energy = float(revenue.sum())
+            energy_total += energy
+            by_type[type_name] = {
+                'customers': histogram.customers,
+                'units': histogram.total_units,
+                'energy_charges': energy,
+                'slabs': [{'lower': lower, 'upper': upper, 'rate': rate,
+                           'units': float(u), 'energy_charges': float(r)}
+                          for (lower, upper, rate), u, r in zip(slabs, slab_units, revenue)],
+            }
+        results[name] = {
+            'energy_charges': energy_total,
+            'electricity_duty': energy_total * duty_rate,
+            'by_type': by_type,
+        }
+    return results
+
+def benchmark_tariffs(n=5_000_000, n_scenarios=200):
+    """Time simulate_tariffs on n random customers and n_scenarios random slab tables."""
+    if np is None:
+        raise ImportError("benchmark_tariffs requires NumPy")
+    rng = np.random.default_rng(0)
+    readings = {
+        'type_code': rng.integers(0, len(CUSTOMER_TYPES) + 1, n).astype(np.int8),
+        'previous_reading': rng.integers(0, 90_000, n).astype(np.float64),
+    }
+    readings['current_reading'] = readings['previous_reading'] + rng.integers(0, 1500, n)
+    scenarios = {'current': current_tariff()}
+    for i in range(n_scenarios - 1):
+        tables = {}
+        for type_name, slabs in ENERGY_SLABS.items():
+            factor = rng.uniform(0.8, 1.2)
+            shift = int(rng.integers(-20, 21))
+            tables[type_name] = tuple(
+                (lower + shift if lower else 0, upper + shift, round(rate * factor, 2))
+                for lower, upper, rate in slabs)
+        scenarios[f'scenario {i + 1}'] = {'energy_slabs': tables}
+
+    start = time.perf_counter()
+    histograms = consumption_histograms(readings)
+    binning = time.perf_counter() - start
+    start = time.perf_counter()
+    results = simulate_tariffs(histograms, scenarios)
+    simulate = time.perf_counter() - start
+
+    # Check one scenario against billing every customer
+    bills = bill_arrays(readings['type_code'], readings['previous_reading'],
+                        readings['current_reading'], np.ones(n))
+    expected = bills['energy_charges'].sum()
+    assert abs(results['current']['energy_charges'] - expected) <= 1e-9 * expected
+
+    print(f"{n} customers: binning {binning:.2f} s, {len(scenarios)} scenarios {simulate:.3f} s "
+          f"({simulate / len(scenarios) * 1e6:.0f} us per scenario)")
+    print(f"Current tariff energy revenue: Rs. {results['current']['energy_charges']:,.2f} "
+          f"(per-customer billing: Rs. {expected:,.2f})")
+
+def write_sample_readings(path, n, seed=0):
+    """Write a readings CSV with n random customers (used by the benchmarks)."""
+    rng = random.Random(seed)
+    types = ('Domestic', 'domestic', 'Commercial', 'industrial')
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        f.write('customer_id,customer_name,customer_type,previous_reading,current_reading,connected_load\n')
+        for start in range(0, n, 10000):
+            lines = []
+            for i in range(start, min(n, start + 10000)):
+                previous = rng.randint(0, 90000)
+                lines.append(f'C{i:08d},Customer {i},{rng.choice(types)},{previous},'
+                             f'{previous + rng.randint(0, 800)},{rng.randint(1, 50) / 2}\n')
+            f.write(''.join(lines))
+
+def benchmark_batch(n=5_000_000):
+    """Time bill_batch against the per-customer functions on n random readings."""
+    if np is None:
+        raise ImportError("benchmark_batch requires NumPy")
+    fd, path = tempfile.mkstemp(suffix='.csv')
+    os.close(fd)
+    try:
+        print(f"Writing {n} readings to {path} ...")
+        write_sample_readings(path, n)
+        start = time.perf_counter()
+        bills = bill_batch(path)
+        elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        arrays = bill_arrays(bills['type_code'], bills['previous_reading'],
+                             bills['current_reading'], bills['connected_load'])
+        compute = time.perf_counter() - start
+
+        sample = min(n, 200_000)
+        start = time.perf_counter()
+        for i in range(sample):
+            ctype = bills['customer_type'][i]
+            units = bills['current_reading'][i] - bills['previous_reading'][i]
+            energy = calculate_energy_charges(units, ctype)
+            total = (energy + calculate_fixed_charges(ctype, bills['connected_load'][i])
+                     + calculate_customer_charges(ctype) + calculate_electricity_duty(energy))
+            assert abs(total - arrays['total'][i]) < 1e-6
+        scalar = (time.perf_counter() - start) / sample
+
+        print(f"bill_batch (CSV parse + billing): {elapsed:.2f} s, {n / elapsed / 1e6:.2f}M bills/s")
+        print(f"bill_arrays (billing only):       {compute:.3f} s, {n / compute / 1e6:.1f}M bills/s")
+        print(f"per-customer functions:           {1 / scalar / 1e6:.2f}M bills/s")
+        print(f"Total billed: Rs. {arrays['total'].sum():,.2f}")
+    finally:
+        os.remove(path)
+
+def print_bill(customer_name, customer_type, previous_reading, current_reading, connected_load):
+    text, total_bill = render_bill(customer_name, customer_type, previous_reading,
+                                   current_reading, connected_load)
+    print(text, end='')
     return total_bill
 
 def main():
@@ -138,5 +933,52 @@ def main():
     # Generate and print the bill
     print_bill(customer_name, customer_type, previous_reading, current_reading, connected_load)
 
+def cli(argv=None):
+    parser = argparse.ArgumentParser(description='TGNPDCL electricity bill calculator')
+    parser.add_argument('--batch', metavar='READINGS_CSV',
+                        help='Bill every customer in a readings CSV and print the totals')
+    parser.add_argument('--bills', metavar='OUT',
+                        help='With --batch: write a printed bill for every customer to OUT')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='Worker processes for --bills (default: 1)')
+    parser.add_argument('--state', metavar='DB',
+                        help='SQLite billing state: --batch checkpoints every bill there')
+    parser.add_argument('--changes', metavar='READINGS_CSV',
+                        help='With --state: re-bill only customers whose inputs or tariff changed')
+    parser.add_argument('--benchmark', action='store_true', help='Benchmark the batch engine')
+    parser.add_argument('--benchmark-tariffs', action='store_true',
+                        help='Benchmark the tariff what-if simulation')
+    args = parser.parse_args(argv)
+    if args.changes and not args.state:
+        parser.error('--changes requires --state')
+    if args.benchmark:
+        benchmark_batch()
+    elif args.benchmark_tariffs:
+        benchmark_tariffs()
+    elif args.changes:
+        start = time.perf_counter()
+        with BillingStateStore(args.state) as store:
+            bills, skipped = incremental_bill(args.changes, store)
+        elapsed = time.perf_counter() - start
+        print(f"Re-billed {len(bills) - skipped} customer(s), skipped {skipped} unchanged "
+              f"({elapsed:.2f} s)")
+    elif args.batch and args.bills:
+        render_bills(args.batch, args.bills, jobs=args.jobs)
+    elif args.batch:
+        start = time.perf_counter()
+        if args.state:
+            with BillingStateStore(args.state) as store:
+                bills = bill_batch(args.batch, store=store)
+        else:
+            bills = bill_batch(args.batch)
+        elapsed = time.perf_counter() - start
+        count = len(bills.get('total', ()))
+        print(f"Bills: {count} ({elapsed:.2f} s)")
+        if count:
+            for name in ('energy_charges', 'fixed_charges', 'customer_charges', 'electricity_duty', 'total'):
+                print(f"{name.replace('_', ' ').title()}: Rs. {bills[name].sum():,.2f}")
+    else:
+        main()
+
 if __name__ == "__main__":
-    main()
+    cli()
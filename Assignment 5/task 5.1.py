@@ -4,22 +4,61 @@ import secrets
 import json
 import os
 import re
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
 from datetime import datetime, timedelta
+from itertools import islice
 from typing import Optional, Dict, Tuple
 
+# Compact the session log once it holds this many records, or more records
+# than half the live sessions, whichever is larger (amortised O(1) per event)
+COMPACT_MIN_RECORDS = 10_000
+
+# Sessions serialised per json.dumps call when writing a snapshot; small
+# batches let the GIL switch back to request threads during compaction
+SNAPSHOT_BATCH = 10_000
+
+
+def _open_private(path: str, flags: int):
+    """Open a file for writing, created with owner-only permissions (0o600 on Unix)."""
+    fd = os.open(path, flags | os.O_WRONLY | os.O_CREAT, 0o600)
+    return os.fdopen(fd, 'a' if flags & os.O_APPEND else 'w', encoding='utf-8')
+
+
 class LoginSystem:
     """
     Secure login system with password hashing, session management, and rate limiting.
+    
+    Sessions are persisted as an append-only log of create/delete records
+    (session_file + '.log', one JSON object per line), so a login costs one
+    small append instead of rewriting every session. A background thread
+    periodically compacts the log into a snapshot (session_file, the same
+    JSON object as before). On startup the snapshot is loaded and the log
+    tail replayed on top of it.
     """
     
-    def __init__(self, users_file: str = "users.json", session_file: str = "sessions.json"):
+    def __init__(self, users_file: str = "users.json", session_file: str = "sessions.json",
+                 compact_min_records: int = COMPACT_MIN_RECORDS):
         self.users_file = users_file
         self.session_file = session_file
+        self.log_file = session_file + '.log'
+        self.compacting_file = session_file + '.log.compacting'
+        self.compact_min_records = compact_min_records
         self.sessions: Dict[str, Dict] = {}
         self.login_attempts: Dict[str, list] = {}
         self.max_attempts = 5
         self.lockout_duration = timedelta(minutes=15)
         
+        # Guards self.sessions, the log handle and log rotation
+        self._lock = threading.Lock()
+        self._log = None
+        self._log_records = 0
+        self._compactor: Optional[threading.Thread] = None
+        
         # Load existing data
         self.load_users()
         self.load_sessions()
@@ -41,18 +80,127 @@ class LoginSystem:
             os.chmod(self.users_file, 0o600)
     
     def load_sessions(self):
-        """Load sessions from file"""
+        """Load the session snapshot, then replay the log records written after it"""
+        self.sessions = {}
         if os.path.exists(self.session_file):
             with open(self.session_file, 'r') as f:
                 self.sessions = json.load(f)
+        # A leftover .compacting log means a compaction was interrupted; its
+        # records are older than those in the current log
+        interrupted = os.path.exists(self.compacting_file)
+        for path in (self.compacting_file, self.log_file):
+            if os.path.exists(path):
+                count, torn = self._replay(path)
+                self._log_records += count
+                interrupted = interrupted or torn
+        if interrupted:
+            # Appending after a torn line would corrupt the next record, so
+            # fold everything into a snapshot and start a clean log
+            self.save_sessions()
+        else:
+            self._log = _open_private(self.log_file, os.O_APPEND)
     
-    def save_sessions(self):
-        """Save sessions to file"""
-        with open(self.session_file, 'w') as f:
-            json.dump(self.sessions, f, indent=2)
+    def _replay(self, path: str) -> Tuple[int, bool]:
+        """Apply the records of a session log to self.sessions.
+
+        Returns (records applied, whether the log ended in a torn line).
+        A final line without its newline counts as torn even when it parses,
+        since the next append would be glued onto it.
+        """
+        count = 0
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    return count, True  # torn final line from a crash mid-append
+                if record['op'] == 'create':
+                    self.sessions[record['token']] = record['session']
+                else:
+                    self.sessions.pop(record['token'], None)
+                count += 1
+                if not line.endswith('\n'):
+                    return count, True
+        return count, False
+    
+    def _append(self, record: Dict):
+        """Append one record to the session log (caller holds the lock)"""
+        self._log.write(json.dumps(record, separators=(',', ':')) + '\n')
+        self._log.flush()
+        self._log_records += 1
+        if (self._log_records >= max(self.compact_min_records, len(self.sessions) // 2)
+                and (self._compactor is None or not self._compactor.is_alive())):
+            self._start_compaction()
+    
+    def _start_compaction(self):
+        """Rotate the log and snapshot the sessions in the background (caller holds the lock)"""
+        if os.path.exists(self.compacting_file):
+            return  # an earlier compaction failed; its log is replayed on the next startup
+        self._log.close()
+        os.replace(self.log_file, self.compacting_file)
+        self._log = _open_private(self.log_file, os.O_APPEND)
+        self._log_records = 0
+        # Session dicts are never mutated, so a shallow copy is a consistent snapshot
+        snapshot = dict(self.sessions)
+        self._compactor = threading.Thread(target=self._compact, args=(snapshot,), daemon=True)
+        self._compactor.start()
+    
+    def _compact(self, snapshot: Dict[str, Dict]):
+        """Write a snapshot, then drop the log it supersedes"""
+        self._write_snapshot(snapshot)
+        os.remove(self.compacting_file)
+    
+    def _write_snapshot(self, sessions: Dict[str, Dict]):
+        """Atomically replace the snapshot file (temp file + fsync + rename)"""
+        tmp = self.session_file + '.tmp'
+        with _open_private(tmp, os.O_TRUNC) as f:
+            f.write('{')
+            items = iter(sessions.items())
+            first = True
+            while True:
+                batch = dict(islice(items, SNAPSHOT_BATCH))
+                if not batch:
+                    break
+                if not first:
+                    f.write(',')
+                f.write(json.dumps(batch, separators=(',', ':'))[1:-1])
+                first = False
+            f.write('}')
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.session_file)
         if os.name != 'nt':
             os.chmod(self.session_file, 0o600)
     
+    def save_sessions(self):
+        """Write a full snapshot now and start a fresh, empty log"""
+        with self._lock:
+            # Compactions only start under the lock, so after this join no
+            # other snapshot writer can run until we are done
+            self.wait_for_compaction()
+            self._write_snapshot(self.sessions)
+            if self._log is not None:
+                self._log.close()
+            for path in (self.compacting_file, self.log_file):
+                if os.path.exists(path):
+                    os.remove(path)
+            self._log = _open_private(self.log_file, os.O_APPEND)
+            self._log_records = 0
+    
+    def wait_for_compaction(self):
+        """Block until a running background compaction has finished"""
+        compactor = self._compactor
+        if compactor is not None:
+            compactor.join()
+    
+    def close(self):
+        """Finish any compaction and close the session log"""
+        with self._lock:
+            self.wait_for_compaction()
+            if self._log is not None:
+                self._log.close()
+                self._log = None
+    
     def validate_username(self, username: str) -> Tuple[bool, Optional[str]]:
         """
         Validate username format.
@@ -174,12 +322,14 @@ class LoginSystem:
         token = secrets.token_urlsafe(32)
         expires_at = datetime.now() + timedelta(hours=24)
         
-        self.sessions[token] = {
+        session = {
             'username': username,
             'created_at': datetime.now().isoformat(),
             'expires_at': expires_at.isoformat()
         }
-        self.save_sessions()
+        with self._lock:
+            self.sessions[token] = session
+            self._append({'op': 'create', 'token': token, 'session': session})
         return token
     
     def validate_session(self, token: str) -> Optional[str]:
@@ -191,8 +341,7 @@ class LoginSystem:
         expires_at = datetime.fromisoformat(session['expires_at'])
         
         if datetime.now() > expires_at:
-            del self.sessions[token]
-            self.save_sessions()
+            self._delete_session(token)
             return None
         
         return session['username']
@@ -236,17 +385,63 @@ class LoginSystem:
         token = self.create_session(username)
         return True, "Login successful", token
     
+    def _delete_session(self, token: str) -> bool:
+        """Remove a session and log the deletion"""
+        with self._lock:
+            if self.sessions.pop(token, None) is None:
+                return False
+            self._append({'op': 'delete', 'token': token})
+            return True
+    
     def logout(self, token: str) -> bool:
         """Logout and invalidate session"""
-        if token in self.sessions:
-            del self.sessions[token]
-            self.save_sessions()
-            return True
-        return False
+        return self._delete_session(token)
+
+
+def benchmark_sessions(max_sessions: int = 10 ** 6, samples: int = 1000):
+    """Show session persistence latency staying flat as live sessions grow.
+    
+    At each size, times `samples` create_session calls (the part of login
+    that touches disk) plus one full login, and one full snapshot write,
+    which is what every login used to cost.
+    """
+    workdir = tempfile.mkdtemp(prefix='login_bench_')
+    try:
+        system = LoginSystem(os.path.join(workdir, 'users.json'), os.path.join(workdir, 'sessions.json'))
+        system.register_user('bench_user', 'Bench@12345')
+        print(f"{'sessions':>10} {'median':>10} {'p99':>10} {'login':>10} {'full rewrite':>14}")
+        size = 1000
+        while size <= max_sessions:
+            while len(system.sessions) < size:
+                system.create_session('bench_user')
+            times = []
+            for _ in range(samples):
+                start = time.perf_counter()
+                system.create_session('bench_user')
+                times.append(time.perf_counter() - start)
+            times.sort()
+            start = time.perf_counter()
+            system.login('bench_user', 'Bench@12345')
+            login_time = time.perf_counter() - start
+            system.wait_for_compaction()
+            start = time.perf_counter()
+            system._write_snapshot(system.sessions)
+            rewrite = time.perf_counter() - start
+            print(f"{len(system.sessions):>10} {statistics.median(times) * 1e6:>8.1f}us "
+                  f"{times[int(len(times) * 0.99)] * 1e6:>8.1f}us {login_time * 1e3:>8.1f}ms "
+                  f"{rewrite * 1e3:>12.1f}ms")
+            size *= 10
+        system.close()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
 
 
 # Example usage and testing
 if __name__ == "__main__":
+    if '--benchmark' in sys.argv:
+        benchmark_sessions()
+        sys.exit(0)
+    
     # Initialize login system
     login_system = LoginSystem()
     
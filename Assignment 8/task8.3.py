@@ -1,4 +1,15 @@
-import re
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, List, Tuple
+
+# Lines handed to a worker process at a time by scan_corpus
+CORPUS_BATCH_LINES = 2000
+
+# Same rules as is_sentence_palindrome: keep ASCII letters/digits, lowercase
+_FOLD = bytes.maketrans(b'ABCDEFGHIJKLMNOPQRSTUVWXYZ', b'abcdefghijklmnopqrstuvwxyz')
+_NON_ALNUM = bytes(b for b in range(256) if not (b < 128 and chr(b).isalnum()))
+
 
 def is_sentence_palindrome(sentence: str) -> bool:
     """
@@ -6,11 +17,125 @@ def is_sentence_palindrome(sentence: str) -> bool:
     Ignores case, spaces, and punctuation.
     Digits are considered part of the content.
     """
-    # Remove all non-alphanumeric characters using regex
-    cleaned = re.sub(r'[^A-Za-z0-9]', '', sentence).lower()
+    # Walk two pointers inward, skipping anything but ASCII letters/digits,
+    # and stop at the first mismatch (no cleaned or reversed copies)
+    i, j = 0, len(sentence) - 1
+    while i < j:
+        a = sentence[i]
+        if not (a.isascii() and a.isalnum()):
+            i += 1
+            continue
+        b = sentence[j]
+        if not (b.isascii() and b.isalnum()):
+            j -= 1
+            continue
+        if a.lower() != b.lower():
+            return False
+        i += 1
+        j -= 1
+    return True
+
+
+def normalize(sentence: str) -> str:
+    """Return the sentence as is_sentence_palindrome sees it: ASCII letters/digits, lowercase."""
+    return sentence.encode('ascii', 'ignore').translate(_FOLD, _NON_ALNUM).decode('ascii')
+
+
+def _manacher(text: str) -> List[int]:
+    """Manacher's algorithm in O(n).
+
+    Works on text interleaved with '#' (plus '^'/'$' sentinels); entry i is
+    the length, in the original text, of the longest palindrome centred at
+    position i of the interleaved string.
+    """
+    t = '^#' + '#'.join(text) + '#$'
+    radius = [0] * len(t)
+    center = right = 0
+    for i in range(1, len(t) - 1):
+        if i < right:
+            radius[i] = min(right - i, radius[2 * center - i])
+        # Sentinels differ from everything, so the expansion stops at the ends
+        while t[i + radius[i] + 1] == t[i - radius[i] - 1]:
+            radius[i] += 1
+        if i + radius[i] > right:
+            center, right = i, i + radius[i]
+    return radius
+
+
+def palindrome_stats(sentence: str) -> Tuple[str, int]:
+    """Return (longest palindromic substring, number of palindromic substrings).
+
+    Both come from one Manacher pass over normalize(sentence). Substrings
+    are counted by position, so 'aaa' has 6; the longest one is returned
+    normalised, and the leftmost wins ties.
+    """
+    text = normalize(sentence)
+    radius = _manacher(text)
+    best = max(range(len(radius)), key=radius.__getitem__)
+    start = (best - radius[best] - 1) // 2
+    count = sum((r + 1) // 2 for r in radius)
+    return text[start:start + radius[best]], count
+
+
+def longest_palindrome(sentence: str) -> str:
+    """Longest palindromic substring of normalize(sentence), in O(n)."""
+    return palindrome_stats(sentence)[0]
+
+
+def count_palindromes(sentence: str) -> int:
+    """Number of non-empty palindromic substrings of normalize(sentence), in O(n)."""
+    return palindrome_stats(sentence)[1]
+
 
-    # Compare cleaned string with its reverse
-    return cleaned == cleaned[::-1]
+def _scan_lines(lines: List[str]) -> List[Tuple[str, int]]:
+    """Worker: palindrome_stats for a batch of lines."""
+    return [palindrome_stats(line) for line in lines]
+
+
+def _line_batches(path: str, batch_lines: int) -> Iterator[List[str]]:
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        batch = []
+        for line in f:
+            batch.append(line.rstrip('\r\n'))
+            if len(batch) == batch_lines:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+
+def scan_corpus(path: str, jobs: int = 1,
+                batch_lines: int = CORPUS_BATCH_LINES) -> Iterator[Tuple[int, str, int]]:
+    """Yield (line number, longest palindrome, palindrome count) for every line of a file.
+
+    Lines are streamed in batches; with jobs > 1 the batches are spread over
+    a process pool, with at most 2 * jobs batches in flight so memory stays
+    bounded however large the corpus is. Results come back in line order.
+    """
+    if jobs < 1:
+        raise ValueError('jobs must be at least 1')
+    line_no = 0
+    if jobs == 1:
+        for batch in _line_batches(path, batch_lines):
+            for longest, count in _scan_lines(batch):
+                line_no += 1
+                yield line_no, longest, count
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        pending = deque()
+        batches = _line_batches(path, batch_lines)
+        for batch in batches:
+            pending.append(pool.submit(_scan_lines, batch))
+            if len(pending) < 2 * jobs:
+                continue
+            for longest, count in pending.popleft().result():
+                line_no += 1
+                yield line_no, longest, count
+        while pending:
+            for longest, count in pending.popleft().result():
+                line_no += 1
+                yield line_no, longest, count
 
 
 
@@ -77,6 +202,42 @@ def run_tests() -> None:
 	print(f"Passed {passed}/{total} tests")
 
 
+def run_substring_tests() -> None:
+	"""Checks for longest_palindrome / count_palindromes against known answers."""
+	test_cases = [
+		# (sentence, longest, count)
+		("", "", 0),
+		("a", "a", 1),
+		("aaa", "aaa", 6),
+		("abc", "a", 3),
+		("abba", "abba", 6),
+		("babad", "bab", 7),
+		("Race car!", "racecar", 10),
+		("No lemon, no melon", "nolemonnomelon", 21),
+		("xx 12321 yy", "12321", 13),
+	]
+
+	total = 0
+	passed = 0
+
+	for sentence, longest, count in test_cases:
+		total += 1
+		result = (longest_palindrome(sentence), count_palindromes(sentence))
+		if result == (longest, count):
+			passed += 1
+		else:
+			print(f"FAIL: input={sentence!r}, expected={(longest, count)}, got={result}")
+
+	print(f"Passed {passed}/{total} substring tests")
+
+
 if __name__ == "__main__":
-	run_tests()
+	if len(sys.argv) > 1:
+		# task8.3.py CORPUS [JOBS]: longest palindrome and count for every line
+		jobs = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+		for line_no, longest, count in scan_corpus(sys.argv[1], jobs=jobs):
+			print(f"{line_no}\t{count}\t{longest}")
+	else:
+		run_tests()
+		run_substring_tests()
 